@@ -0,0 +1,121 @@
+import heapq
+import time
+from grid import as_grid
+
+# Busca "a qualquer momento" (ARA*, A* com peso decrescente)
+# A primeira solução sai de um A* com a heurística inflada (f = g + w·h): expande bem menos
+# células e o custo fica provadamente <= w vezes o ótimo. Depois o peso desce de decrease em
+# decrease até 1 e cada rodada reaproveita a anterior: os g conhecidos continuam valendo, a
+# lista aberta só é reordenada com o novo peso e recebe as células inconsistentes (as que
+# melhoraram depois de expandidas na rodada), e cada célula é expandida no máximo uma vez
+# por rodada. Ao fim de cada rodada o limite provado é min(w, custo / menor g + h entre as
+# células abertas ou inconsistentes); com limite 1 o custo é o mesmo de a_star_search.
+# max_time (segundos) e max_expansions limitam o trabalho depois da primeira solução, que
+# sempre é calculada; max_expansions=0 devolve só a primeira.
+
+DEFAULT_WEIGHT = 1.5
+
+# Gerador de soluções cada vez melhores: (caminho 0-based, custo, limite de subotimalidade)
+# Sem caminho não gera nada. stats: mesmos contadores de a_star_search mais 'solutions',
+# 'weight' (último peso usado) e 'bound'
+def ara_star(maze, start, end, is_dungeon=False, weight=DEFAULT_WEIGHT, decrease=0.5, max_time=None,
+             max_expansions=None, h_scale=None, stats=None):
+    grid = as_grid(maze)
+    costs, wall = grid.flat_costs(is_dungeon)
+    width = grid.width
+    scale = grid.min_cost(is_dungeon) if h_scale is None else h_scale
+    er, ec = end[0], end[1]
+    start_idx = grid.index(start[0]-1, start[1]-1)
+    end_idx = grid.index(end[0]-1, end[1]-1)
+    deadline = None if max_time is None else time.perf_counter() + max_time
+    limit = float('inf') if max_expansions is None else max_expansions
+
+    def h(idx):
+        r, c = divmod(idx, width)
+        return (abs(r-er) + abs(c-ec)) * scale
+
+    w = max(1.0, weight)
+    best_g = {start_idx: 0}
+    parent = {start_idx: -1}
+    # Entradas do heap: (f, h, índice, g); só uma entrada por célula tem g == best_g
+    h0 = h(start_idx)
+    open_list = [(w*h0, h0, start_idx, 0)]
+    closed, incons = set(), set()
+    expanded = pushed = max_open = solutions = 0
+    bound = float('inf')
+    track = stats is not None
+    try:
+        while True:
+            # Uma rodada: expande enquanto alguma célula aberta tiver f menor que o custo do objetivo
+            out_of_budget = False
+            while open_list:
+                f, _, idx, g = open_list[0]
+                if g > best_g[idx]:
+                    heapq.heappop(open_list)
+                    continue
+                if f >= best_g.get(end_idx, float('inf')): break
+                if solutions and (expanded >= limit or
+                                  (deadline is not None and expanded & 255 == 0 and time.perf_counter() > deadline)):
+                    out_of_budget = True
+                    break
+                heapq.heappop(open_list)
+                closed.add(idx)
+                expanded += 1
+                for nidx in (idx-width, idx+width, idx-1, idx+1):
+                    cost = costs[nidx]
+                    if cost == wall: continue
+                    new_g = g + cost
+                    if new_g >= best_g.get(nidx, float('inf')): continue
+                    best_g[nidx] = new_g
+                    parent[nidx] = idx
+                    # Já expandida nesta rodada: volta à lista aberta só na próxima
+                    if nidx in closed:
+                        incons.add(nidx)
+                        continue
+                    hn = h(nidx)
+                    heapq.heappush(open_list, (new_g + w*hn, hn, nidx, new_g))
+                    pushed += 1
+                if track and len(open_list) > max_open: max_open = len(open_list)
+            if out_of_budget or end_idx not in best_g: return
+
+            # Caminho pelos pais; o custo é somado de novo porque um g pode ter ficado acima
+            # do caminho atual até a célula (ancestral melhorado e ainda não propagado)
+            path, idx, cost = [], end_idx, 0
+            while idx != -1:
+                path.append(grid.position(idx))
+                if idx != start_idx: cost += costs[idx]
+                idx = parent[idx]
+            frontier = [(best_g[i], i) for _, _, i, g in open_list if g == best_g[i]]
+            frontier += [(best_g[i], i) for i in incons]
+            lower = min((g + h(i) for g, i in frontier), default=cost)
+            bound = max(1.0, min(w, cost / lower)) if lower else 1.0
+            solutions += 1
+            yield path[::-1], cost, bound
+            if bound <= 1.0: return
+
+            # Próxima rodada com peso menor, a partir das células abertas e inconsistentes
+            w = max(1.0, w - decrease)
+            open_list = []
+            for g, i in frontier:
+                hi = h(i)
+                open_list.append((g + w*hi, hi, i, g))
+            heapq.heapify(open_list)
+            pushed += len(incons)
+            closed.clear()
+            incons.clear()
+    finally:
+        if track:
+            stats.update({'algorithm': 'ara_star', 'expanded': expanded, 'pushed': pushed + 1, 'max_open': max_open,
+                          'duplicates': pushed + 1 - len(best_g), 'solutions': solutions, 'weight': w, 'bound': bound})
+
+# Melhor solução encontrada dentro do orçamento: (caminho, custo, limite), como a_star_search
+# mais o limite; sem caminho devolve (None, inf, 1.0). stats recebe também 'wall_time'
+def anytime_search(maze, start, end, is_dungeon=False, weight=DEFAULT_WEIGHT, decrease=0.5, max_time=None,
+                   max_expansions=None, h_scale=None, stats=None):
+    if not maze: return None, float('inf'), 1.0
+    started = time.perf_counter()
+    result = None, float('inf'), 1.0
+    for result in ara_star(maze, start, end, is_dungeon, weight, decrease, max_time, max_expansions, h_scale, stats):
+        pass
+    if stats is not None: stats['wall_time'] = time.perf_counter() - started
+    return result
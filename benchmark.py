@@ -0,0 +1,158 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from PIL import Image
+from map_generator import hyrule_map, dungeon_map, random_points, synthetic_scenario
+from search import a_star_search
+from order_solver import choose_solver, solve_order
+from render import aSTAR_COLORS, DUNGEON_COLORS, plot_path_on_map
+from main import JourneyLegs, simulate_journey
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "mapas"))
+from conversor import convert_image, palette_from
+import conversor_hyrule
+
+# Benchmarks em mapas sintéticos (map_generator) de vários tamanhos
+# Cada medição roda `repeat` vezes para o tempo (vale o menor) e uma vez a mais com
+# tracemalloc para o pico de memória (o tracemalloc deixa o código mais lento).
+# A saída JSON pode ser comparada entre commits com --comparar.
+# Uso: python benchmark.py --tamanhos 64 256 --saida bench.json [--comparar antigo.json]
+
+SIZES = (64, 256, 1024, 4096)
+DEFAULT_SIZES = (64, 256, 1024)
+
+def measure(fn, repeat=1):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result, best, peak
+
+# Buscas entre dois pontos sorteados, nos dois modos (A* puro, JPS e ALT quando fizer sentido)
+def bench_search(size, seed, repeat):
+    hyrule, dungeon = hyrule_map(size, seed), dungeon_map(size, seed)
+    cases = [('hyrule', hyrule, False, 'astar', {'use_jps': False}),
+             ('hyrule', hyrule, False, 'bidirecional', {'bidirectional': True}),
+             ('masmorra', dungeon, True, 'astar', {'use_jps': False}),
+             ('masmorra', dungeon, True, 'jps', {})]
+    for map_name, grid, is_dungeon, variant, options in cases:
+        start, end = random_points(grid, 2, seed, is_dungeon)
+        stats = {}
+        (path, cost), wall, peak = measure(lambda: a_star_search(grid, start, end, is_dungeon, stats=stats, **options), repeat)
+        yield {'map': map_name, 'variant': variant, 'wall_time': wall, 'peak_memory': peak,
+               'expanded': stats.get('expanded'), 'cost': cost, 'path_length': len(path) if path else 0}
+
+# Jornada completa: trechos entre pontos de passagem, escolha da ordem e simulação
+def bench_journey(size, seed, repeat):
+    hyrule, dungeons, start_pos, lost_woods = synthetic_scenario(size, seed=seed)
+    def run():
+        legs = JourneyLegs(hyrule, dungeons, start_pos, lost_woods)
+        order, _ = solve_order(legs.order_matrix(), choose_solver(len(dungeons)))
+        return simulate_journey(order, hyrule, dungeons, start_pos, lost_woods, save_images=False, legs=legs)
+    cost, wall, peak = measure(run, repeat)
+    yield {'map': 'cenario', 'variant': 'main', 'wall_time': wall, 'peak_memory': peak, 'cost': cost}
+
+# Imagem do mapa com um caminho (célula de no máximo 20 pixels e imagem de até ~4096 pixels de lado)
+def bench_plot(size, seed, repeat):
+    grid = hyrule_map(size, seed)
+    path, _ = a_star_search(grid, *random_points(grid, 2, seed))
+    cell_size = max(1, min(20, 4096 // size))
+    with tempfile.TemporaryDirectory() as folder:
+        filename = os.path.join(folder, "mapa.png")
+        def run():
+            with contextlib.redirect_stdout(io.StringIO()):
+                plot_path_on_map(grid, path, filename, False, cell_size)
+        _, wall, peak = measure(run, repeat)
+    yield {'map': 'hyrule', 'variant': f'celula_{cell_size}', 'wall_time': wall, 'peak_memory': peak}
+
+# Conversores: a grade sintética vira uma imagem JPEG (4 pixels por célula, até 1024 células
+# por lado) que é convertida de volta para texto
+def bench_converters(size, seed, repeat):
+    grid_size = min(size, 1024)
+    cell_px = 4
+    cases = [('hyrule', hyrule_map(grid_size, seed), aSTAR_COLORS, conversor_hyrule, 'mean', 0),
+             ('masmorra', dungeon_map(grid_size, seed), DUNGEON_COLORS, None, 'mode', 1)]
+    with tempfile.TemporaryDirectory() as folder:
+        for map_name, grid, colors, module, summary, margin in cases:
+            lut = np.zeros((256, 3), dtype=np.uint8)
+            for letter, color in colors.items(): lut[ord(letter)] = color
+            pixels = lut[grid.terrain()].repeat(cell_px, axis=0).repeat(cell_px, axis=1)
+            img_path = os.path.join(folder, map_name + ".jpg")
+            Image.fromarray(pixels).save(img_path, quality=95)
+            palette = palette_from(module.sample_colors, module.terrain_to_letter) if module else \
+                {'#': DUNGEON_COLORS['#'], '.': DUNGEON_COLORS['.']}
+            out_path = os.path.join(folder, map_name + ".txt")
+            _, wall, peak = measure(lambda: convert_image(img_path, out_path, palette, grid_size, summary, margin), repeat)
+            yield {'map': map_name, 'variant': summary, 'wall_time': wall, 'peak_memory': peak,
+                   'image_pixels': pixels.shape[0] * pixels.shape[1]}
+
+BENCHMARKS = {'search': bench_search, 'journey': bench_journey, 'plot': bench_plot, 'converters': bench_converters}
+
+def current_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+def run_benchmarks(sizes=DEFAULT_SIZES, names=None, seed=0, repeat=1, log=print):
+    results = []
+    for name in names or BENCHMARKS:
+        for size in sizes:
+            for row in BENCHMARKS[name](size, seed, repeat):
+                row = {'benchmark': name, 'size': size, **row}
+                results.append(row)
+                log(f"{name:<11}{size:>6} {row['map']:<9}{row['variant']:<14}{row['wall_time']:>10.4f} s"
+                    f"{row['peak_memory']/2**20:>10.1f} MB")
+    return {'commit': current_commit(), 'python': platform.python_version(), 'numpy': np.__version__,
+            'seed': seed, 'repeat': repeat, 'results': results}
+
+# Compara dois relatórios: razão de tempo e de memória (novo / antigo) por medição
+def compare(old, new, log=print):
+    key = lambda row: (row['benchmark'], row['size'], row['map'], row['variant'])
+    previous = {key(row): row for row in old['results']}
+    log(f"Comparando {old.get('commit')} -> {new.get('commit')} (razão novo/antigo)")
+    for row in new['results']:
+        before = previous.get(key(row))
+        if not before: continue
+        time_ratio = row['wall_time'] / before['wall_time'] if before['wall_time'] else float('inf')
+        memory_ratio = row['peak_memory'] / before['peak_memory'] if before['peak_memory'] else float('inf')
+        log(f"{' '.join(map(str, key(row))):<40} tempo x{time_ratio:.2f}  memória x{memory_ratio:.2f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de busca, jornada, imagens e conversores")
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=list(DEFAULT_SIZES), help=f"lados dos mapas (ex.: {SIZES})")
+    parser.add_argument('--apenas', nargs='+', choices=sorted(BENCHMARKS), help="benchmarks a rodar (padrão: todos)")
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--repeticoes', type=int, default=1, help="execuções por medição de tempo (vale a menor)")
+    parser.add_argument('--saida', help="arquivo JSON com os resultados")
+    parser.add_argument('--comparar', help="JSON de uma execução anterior para comparar")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.tamanhos, args.apenas, args.semente, args.repeticoes)
+    if args.saida:
+        with open(args.saida, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Resultados salvos em: {args.saida}")
+    if args.comparar:
+        with open(args.comparar) as f:
+            compare(json.load(f), report)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import heapq
+from grid import as_grid
+from instrumentation import search_counts
+
+# Busca A* bidirecional
+# Uma fronteira sai do início (custo de entrar em cada célula, como no A* normal) e
+# outra sai do objetivo andando ao contrário: ir de u para v custa o custo de entrar em v,
+# então na busca reversa o passo de v para u custa costs[v].
+# g_f(n) + g_b(n) é o custo de um caminho completo passando por n; mu guarda o melhor
+# encontrado. Critério de parada (heurísticas consistentes): todo caminho ainda não
+# encontrado passa por um nó aberto de cada fronteira, logo custa pelo menos o menor f
+# de cada uma; quando mu <= max(menor f da frente, menor f de trás) mu é ótimo.
+
+def bidirectional_search(maze, start, end, is_dungeon=False, stats=None):
+    grid = as_grid(maze)
+    costs, wall = grid.flat_costs(is_dungeon)
+    width = grid.width
+    start_idx = grid.index(start[0]-1, start[1]-1)
+    end_idx = grid.index(end[0]-1, end[1]-1)
+    track = stats is not None
+    if start_idx == end_idx or costs[end_idx] == wall:
+        if track: stats.update(search_counts(0, 0, 0, 0, 0))
+        return ([grid.position(start_idx)], 0) if start_idx == end_idx else (None, float('inf'))
+    sr, sc, er, ec = start[0], start[1], end[0], end[1]
+    # Distância de Manhattan escalada pelo menor custo de passo (admissível nos dois sentidos)
+    scale = grid.min_cost(is_dungeon)
+
+    # Estado de cada lado: melhor g, pai (na volta: próxima célula até o objetivo) e heap
+    g_fwd, g_bwd = {start_idx: 0}, {end_idx: 0}
+    par_fwd, par_bwd = {start_idx: -1}, {end_idx: -1}
+    h = (abs(sr-er) + abs(sc-ec)) * scale
+    open_fwd, open_bwd = [(h, h, start_idx, 0)], [(h, h, end_idx, 0)]
+    mu, meet = float('inf'), -1
+    # Contadores das duas fronteiras somadas (instrumentation.search_counts)
+    expanded = stale = max_open = 0
+
+    while open_fwd and open_bwd:
+        if mu <= max(open_fwd[0][0], open_bwd[0][0]): break
+        forward = open_fwd[0][0] <= open_bwd[0][0]
+        if forward:
+            _, _, idx, g = heapq.heappop(open_fwd)
+            if g > g_fwd[idx]:
+                stale += 1
+                continue
+            expanded += 1
+            for nidx in (idx-width, idx+width, idx-1, idx+1):
+                cost = costs[nidx]
+                if cost == wall: continue
+                new_g = g + cost
+                if new_g >= g_fwd.get(nidx, float('inf')): continue
+                g_fwd[nidx] = new_g
+                par_fwd[nidx] = idx
+                if nidx in g_bwd and new_g + g_bwd[nidx] < mu:
+                    mu, meet = new_g + g_bwd[nidx], nidx
+                nx, ny = divmod(nidx, width)
+                hn = (abs(nx-er) + abs(ny-ec)) * scale
+                heapq.heappush(open_fwd, (new_g + hn, hn, nidx, new_g))
+        else:
+            _, _, idx, g = heapq.heappop(open_bwd)
+            if g > g_bwd[idx]:
+                stale += 1
+                continue
+            expanded += 1
+            # Chegar em idx custa costs[idx]; o início pode ser parede e não é expandido
+            step = costs[idx]
+            if step == wall: continue
+            new_g = g + step
+            for nidx in (idx-width, idx+width, idx-1, idx+1):
+                if costs[nidx] == wall and nidx != start_idx: continue
+                if new_g >= g_bwd.get(nidx, float('inf')): continue
+                g_bwd[nidx] = new_g
+                par_bwd[nidx] = idx
+                if nidx in g_fwd and g_fwd[nidx] + new_g < mu:
+                    mu, meet = g_fwd[nidx] + new_g, nidx
+                nx, ny = divmod(nidx, width)
+                hn = (abs(nx-sr) + abs(ny-sc)) * scale
+                heapq.heappush(open_bwd, (new_g + hn, hn, nidx, new_g))
+        if track and len(open_fwd) + len(open_bwd) > max_open: max_open = len(open_fwd) + len(open_bwd)
+
+    if track:
+        stats.update(search_counts(expanded, stale, len(open_fwd) + len(open_bwd), len(g_fwd) + len(g_bwd), max_open))
+    if meet == -1: return None, float('inf')
+    # Junta as duas metades no ponto de encontro
+    path, idx = [], meet
+    while idx != -1:
+        path.append(grid.position(idx))
+        idx = par_fwd[idx]
+    path.reverse()
+    idx = par_bwd[meet]
+    while idx != -1:
+        path.append(grid.position(idx))
+        idx = par_bwd[idx]
+    return path, mu
@@ -0,0 +1,124 @@
+import heapq
+import weakref
+from collections import OrderedDict
+import numpy as np
+from grid import Grid, as_grid
+
+# Dijkstra sobre o mapa inteiro a partir de uma célula (índice plano da matriz com borda)
+# reverse=False: dist[i] = custo da origem até i; reverse=True: custo de i até a origem
+# next_hop[i] = célula anterior (ida) ou próxima célula até a origem (volta); -1 se não houver
+def dijkstra(grid, source_idx, is_dungeon=False, reverse=False):
+    costs, wall = grid.flat_costs(is_dungeon)
+    width = grid.width
+    inf = float('inf')
+    dist = [inf] * len(costs)
+    next_hop = [-1] * len(costs)
+    dist[source_idx] = 0
+    open_list = [(0, source_idx)]
+    while open_list:
+        d, idx = heapq.heappop(open_list)
+        if d > dist[idx]: continue
+        if reverse:
+            # Entrar na célula idx custa costs[idx]; uma parede não pode ser alcançada
+            step = costs[idx]
+            if step == wall: continue
+            nd = d + step
+        for nidx in (idx-width, idx+width, idx-1, idx+1):
+            if costs[nidx] == wall: continue
+            if not reverse: nd = d + costs[nidx]
+            if nd >= dist[nidx]: continue
+            dist[nidx] = nd
+            next_hop[nidx] = idx
+            heapq.heappush(open_list, (nd, nidx))
+    return dist, next_hop
+
+# Campo de distâncias até um objetivo (Dijkstra reverso sobre o mapa inteiro)
+# dist[i] = custo do melhor caminho da célula i até o objetivo (inf se não houver)
+# next_hop[i] = próxima célula desse caminho (-1 no objetivo ou se não houver caminho)
+# Os dois vetores usam os índices planos da matriz com borda do Grid. Com eles, o
+# custo até o objetivo é uma consulta direta e o caminho é seguir os ponteiros.
+# O campo guarda só a largura, a versão e a assinatura do mapa (não o Grid), para poder ficar no cache.
+class DistanceField:
+    def __init__(self, maze, goal, is_dungeon=False):
+        grid = as_grid(maze)
+        self.goal = tuple(goal)
+        self.is_dungeon = is_dungeon
+        self.version = grid.version
+        self.signature = grid.signature(is_dungeon)
+        self.width = grid.width
+        goal_idx = grid.index(goal[0]-1, goal[1]-1)
+        dist, next_hop = dijkstra(grid, goal_idx, is_dungeon, reverse=True)
+
+        self.dist = np.array(dist, dtype=np.float64)
+        self.next_hop = np.array(next_hop, dtype=np.int32 if len(dist) < 2**31 else np.int64)
+        # Como no A*, dá para sair de uma célula de parede (só a entrada em cada célula custa):
+        # cada parede (menos o objetivo) recebe o melhor custo de entrar num vizinho e seguir dali
+        costs = grid.cost_array(is_dungeon).reshape(-1)
+        wall = np.iinfo(costs.dtype).max
+        inner = np.zeros(grid.cells.shape, dtype=bool)
+        inner[1:-1, 1:-1] = True
+        walls = np.flatnonzero((costs == wall) & inner.reshape(-1))
+        walls = walls[walls != goal_idx]
+        if walls.size:
+            through = np.where(costs == wall, np.inf, costs + self.dist)
+            steps = np.array([-self.width, self.width, -1, 1])
+            candidates = through[walls[:, None] + steps]
+            best = candidates.argmin(axis=1)
+            self.dist[walls] = candidates[np.arange(walls.size), best]
+            self.next_hop[walls] = np.where(np.isinf(self.dist[walls]), -1, walls + steps[best])
+        # memoryview devolve float do Python ao indexar (uso como heurística dentro do A*)
+        self.flat_dist = memoryview(self.dist)
+
+    # Mesmo mapa (conteúdo e custos) e sem alterações desde o cálculo
+    def is_valid(self, grid):
+        return self.version == grid.version and self.signature == grid.signature(self.is_dungeon)
+
+    # Custo da posição (linha, coluna) 1-based até o objetivo
+    # Na matriz com borda, a posição 1-based vira o índice linha*largura + coluna
+    def cost(self, pos):
+        d = self.flat_dist[pos[0]*self.width + pos[1]]
+        return int(d) if d != float('inf') else d
+
+    # Mesmo contrato de a_star_search(maze, pos, goal): (caminho 0-based, custo)
+    def path(self, pos):
+        cost = self.cost(pos)
+        if cost == float('inf'): return None, cost
+        idx = pos[0]*self.width + pos[1]
+        path = []
+        while idx != -1:
+            r, c = divmod(idx, self.width)
+            path.append((r-1, c-1))
+            idx = int(self.next_hop[idx])
+        return path, cost
+
+# Cache de campos por (mapa, objetivo, modo); o campo é recalculado quando o mapa muda
+_fields = weakref.WeakKeyDictionary()
+
+# Mapas em lista (formato antigo) virariam um Grid novo a cada chamada e o cache nunca
+# acertaria: o Grid é reaproveitado pelo conteúdo (últimos MAX_LIST_GRIDS mapas)
+MAX_LIST_GRIDS = 8
+_list_grids = OrderedDict()
+
+def _grid_for(maze):
+    if isinstance(maze, Grid): return maze
+    key = tuple(''.join(row) for row in maze)
+    grid = _list_grids.get(key)
+    if grid is None:
+        grid = _list_grids[key] = Grid.from_maze(maze)
+        if len(_list_grids) > MAX_LIST_GRIDS: _list_grids.popitem(last=False)
+    else:
+        _list_grids.move_to_end(key)
+    return grid
+
+def distance_field(maze, goal, is_dungeon=False):
+    grid = _grid_for(maze)
+    fields = _fields.setdefault(grid, {})
+    key = (tuple(goal), is_dungeon)
+    field = fields.get(key)
+    if field is None or not field.is_valid(grid):
+        field = fields[key] = DistanceField(grid, goal, is_dungeon)
+    return field
+
+def clear_distance_fields():
+    _fields.clear()
+    _list_grids.clear()
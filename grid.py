@@ -0,0 +1,181 @@
+import hashlib
+import numpy as np
+
+# --- Parâmetros e Configurações ---
+TERRAIN_COSTS = {
+    'G': 10, 'A': 20, 'F': 100, 'M': 150, 'W': 180,
+    'S': 10, 'X': 20, 'Y': 20, 'Z': 20, 'L': 10
+}
+
+DUNGEON_PATH_COST = 10
+DUNGEON_WALL = '#'
+
+# Código usado na borda artificial do mapa (não corresponde a nenhum terreno)
+BORDER = 0
+
+# Representação compacta de um mapa
+# As letras do arquivo ficam numa matriz uint8 (1 byte por célula) com uma borda
+# de uma célula ao redor; os custos de cada modo (Hyrule ou masmorra) são calculados
+# uma única vez numa matriz uint8/uint16 do mesmo formato, onde paredes, terrenos
+# desconhecidos e a borda recebem o valor sentinela (maior valor do tipo).
+# Com a borda, a busca não precisa verificar limites: o vizinho fora do mapa é parede.
+# version aumenta a cada alteração do mapa, para invalidar dados derivados (ex.: campos de distância).
+# padded=True usa a matriz recebida (já com a borda) sem copiar, ex.: um memmap do formato binário.
+# waypoints guarda os pontos de passagem nomeados do mapa ({nome: (linha, coluna) 1-based}).
+# legends: custos próprios do mapa por modo ({is_dungeon: {letra: custo, None = parede}}), ex.: a
+# legenda gravada no .map; letras fora da legenda (ou o outro modo) usam os custos padrão.
+class Grid:
+    def __init__(self, cells, padded=False, waypoints=None, legends=None):
+        cells = np.asarray(cells, dtype=np.uint8)
+        if padded:
+            self.cells = cells
+            self.rows, self.cols = cells.shape[0]-2, cells.shape[1]-2
+        else:
+            self.rows, self.cols = cells.shape
+            self.cells = np.full((self.rows+2, self.cols+2), BORDER, dtype=np.uint8)
+            self.cells[1:-1, 1:-1] = cells
+        self.width = self.cols + 2
+        self.waypoints = dict(waypoints or {})
+        self.legends = {mode: dict(legend) for mode, legend in (legends or {}).items()}
+        self.version = 0
+        self._costs = {}
+        self._luts = {}
+        self._hash = None
+        self._stats = {}
+
+    @classmethod
+    def from_maze(cls, maze):
+        # Aceita o formato antigo (lista de listas de caracteres) ou lista de strings
+        lines = [''.join(row) for row in maze]
+        if any(len(line) != len(lines[0]) for line in lines):
+            raise ValueError("Todas as linhas do mapa devem ter o mesmo tamanho")
+        data = np.frombuffer(''.join(lines).encode('ascii'), dtype=np.uint8)
+        return cls(data.reshape(len(lines), len(lines[0])))
+
+    def __len__(self):
+        return self.rows
+
+    def terrain(self):
+        # Letras do mapa sem a borda (view, não copia)
+        return self.cells[1:-1, 1:-1]
+
+    def char(self, r, c):
+        return chr(self.cells[r+1, c+1])
+
+    # Conversão entre (linha, coluna) 0-based e índice plano na matriz com borda
+    def index(self, r, c):
+        return (r+1)*self.width + (c+1)
+
+    def position(self, idx):
+        r, c = divmod(idx, self.width)
+        return r-1, c-1
+
+    def cost_array(self, is_dungeon=False):
+        # Custos por célula para o modo pedido, calculados uma vez e guardados
+        costs = self._costs.get(is_dungeon)
+        if costs is None:
+            table = {} if is_dungeon else TERRAIN_COSTS
+            legend = self.legends.get(is_dungeon, {})
+            top = max(list(table.values()) + [DUNGEON_PATH_COST] + [c for c in legend.values() if c is not None])
+            dtype = np.uint8 if top < np.iinfo(np.uint8).max else np.uint16
+            wall = np.iinfo(dtype).max
+            if is_dungeon:
+                lut = np.full(256, DUNGEON_PATH_COST, dtype=dtype)
+                lut[ord(DUNGEON_WALL)] = wall
+            else:
+                lut = np.full(256, wall, dtype=dtype)
+                for terrain, cost in table.items():
+                    lut[ord(terrain)] = cost
+            for terrain, cost in legend.items():
+                lut[ord(terrain)] = wall if cost is None else cost
+            lut[BORDER] = wall
+            costs = lut[self.cells]
+            self._costs[is_dungeon] = costs
+            self._luts[is_dungeon] = lut
+        return costs
+
+    # Menor custo e custo único (None se houver custos diferentes) das células transitáveis
+    # no modo pedido; recalculados só quando o mapa muda
+    def _cost_stats(self, is_dungeon):
+        cached = self._stats.get(is_dungeon)
+        if cached is None or cached[0] != self.version:
+            costs = self.cost_array(is_dungeon)
+            passable = costs[costs != np.iinfo(costs.dtype).max]
+            if passable.size:
+                low = int(passable.min())
+                uniform = low if low == int(passable.max()) else None
+            else:
+                low, uniform = 1, None
+            cached = self._stats[is_dungeon] = (self.version, low, uniform)
+        return cached[1:]
+
+    # Custo único das células transitáveis (usado para escolher o Jump Point Search)
+    def uniform_cost(self, is_dungeon=False):
+        return self._cost_stats(is_dungeon)[1]
+
+    # Menor custo de um passo (escala da heurística de Manhattan)
+    def min_cost(self, is_dungeon=False):
+        return self._cost_stats(is_dungeon)[0]
+
+    # Tabela de custos (256 entradas, uma por letra) usada no modo pedido
+    def cost_lut(self, is_dungeon=False):
+        self.cost_array(is_dungeon)
+        return self._luts[is_dungeon]
+
+    # Hash do conteúdo (letras) do mapa, recalculado só quando o mapa muda
+    def content_hash(self):
+        if self._hash is None or self._hash[0] != self.version:
+            digest = hashlib.sha256(f"{self.rows}x{self.cols}:".encode())
+            digest.update(self.terrain().tobytes())
+            # Custos próprios mudam os caminhos, então entram no hash (ex.: cache de caminhos)
+            if self.legends:
+                digest.update(repr(sorted((mode, sorted(legend.items())) for mode, legend in self.legends.items())).encode())
+            self._hash = (self.version, digest.hexdigest())
+        return self._hash[1]
+
+    # Identifica o conteúdo e os custos do modo, para validar dados derivados (campos de
+    # distância, marcos) contra o Grid em que são usados: a versão sozinha não distingue mapas
+    def signature(self, is_dungeon=False):
+        return self.content_hash(), self.cost_lut(is_dungeon).tobytes()
+
+    def flat_costs(self, is_dungeon=False):
+        # Retorna (custos, sentinela): memoryview plano dos custos, que indexado devolve int do Python
+        costs = self.cost_array(is_dungeon)
+        return memoryview(costs.reshape(-1)), np.iinfo(costs.dtype).max
+
+    # Altera células do mapa: updates = {(linha, coluna) 1-based: letra}
+    # Com a borda, a posição 1-based é exatamente o índice na matriz interna
+    def set_cells(self, updates):
+        for (r, c), terrain in updates.items():
+            if not (1 <= r <= self.rows and 1 <= c <= self.cols):
+                raise IndexError(f"Posição {(r, c)} fora do mapa")
+            self.cells[r, c] = ord(terrain)
+            for is_dungeon, costs in self._costs.items():
+                costs[r, c] = self._luts[is_dungeon][ord(terrain)]
+        self.version += 1
+
+    # Descarta os custos calculados (usar depois de alterar TERRAIN_COSTS)
+    def reset_costs(self):
+        self._costs.clear()
+        self._luts.clear()
+        self._stats.clear()
+        self.version += 1
+
+def as_grid(maze):
+    return maze if isinstance(maze, Grid) else Grid.from_maze(maze)
+
+# Lê o mapa de um arquivo de texto e cria o Grid
+# Cada linha do arquivo vira uma linha da matriz de células
+def load_map(file_path):
+    lines = []
+    try:
+        with open(file_path, 'r') as file:
+            for line in file:
+                cleaned_line = line.strip().replace(' ', '')
+                if cleaned_line:
+                    lines.append(cleaned_line)
+    except FileNotFoundError:
+        print(f"Erro: Arquivo {file_path} não encontrado.")
+        return None
+    if not lines: return None
+    return Grid.from_maze(lines)
@@ -0,0 +1,107 @@
+import weakref
+import numpy as np
+from grid import as_grid
+from distance_field import dijkstra
+
+# Heurística ALT (A*, landmarks e desigualdade triangular)
+# Para cada marco L guardamos d(L, v) e d(v, L) para todas as células v. Pela desigualdade
+# triangular, d(v, t) >= d(L, t) - d(L, v) e d(v, t) >= d(v, L) - d(t, L); o máximo dessas
+# diferenças sobre todos os marcos é admissível e consistente.
+# Os marcos são escolhidos pelo ponto mais distante: o primeiro é a célula mais longe de
+# uma célula qualquer e cada novo marco é a célula mais longe dos marcos já escolhidos.
+
+DEFAULT_LANDMARKS = 8
+
+class Landmarks:
+    def __init__(self, maze, is_dungeon=False, count=DEFAULT_LANDMARKS):
+        grid = as_grid(maze)
+        self.is_dungeon = is_dungeon
+        self.version = grid.version
+        self.signature = grid.signature(is_dungeon)
+        costs = grid.cost_array(is_dungeon).reshape(-1)
+        passable = np.flatnonzero(costs != np.iinfo(costs.dtype).max)
+        self.landmarks, self.dist_from, self.dist_to = [], [], []
+        self._views = []
+        if not passable.size: return
+
+        seed = np.asarray(dijkstra(grid, int(passable[0]), is_dungeon)[0])
+        closest = np.where(np.isinf(seed), -1, seed)
+        for k in range(count):
+            idx = int(np.argmax(closest))
+            if k and closest[idx] <= 0: break
+            dist_from = np.asarray(dijkstra(grid, idx, is_dungeon)[0])
+            dist_to = np.asarray(dijkstra(grid, idx, is_dungeon, reverse=True)[0])
+            self.landmarks.append(idx)
+            self.dist_from.append(dist_from)
+            self.dist_to.append(dist_to)
+            # Distância de cada célula ao marco mais próximo (células inalcançáveis ficam de fora)
+            reach = np.where(np.isinf(dist_from), -1, dist_from)
+            closest = reach if k == 0 else np.minimum(closest, reach)
+        # memoryviews devolvem float do Python ao indexar, rápido dentro do laço do A*
+        self._views = [(memoryview(f), memoryview(t)) for f, t in zip(self.dist_from, self.dist_to)]
+
+    # Mesmo mapa (conteúdo e custos) e sem alterações desde o cálculo
+    def is_valid(self, grid):
+        return self.version == grid.version and self.signature == grid.signature(self.is_dungeon)
+
+    # Função h(índice) para o objetivo end_idx (índice plano da matriz com borda)
+    def heuristic_to(self, end_idx):
+        inf = float('inf')
+        rows = [(f, t, f[end_idx], t[end_idx]) for f, t in self._views]
+        def h(idx):
+            best = 0
+            for dist_from, dist_to, from_goal, to_goal in rows:
+                fv = dist_from[idx]
+                # Se L alcança v mas não o objetivo, v também não alcança o objetivo (h = inf)
+                if fv != inf and from_goal - fv > best: best = from_goal - fv
+                tv = dist_to[idx]
+                if tv != inf and tv - to_goal > best: best = tv - to_goal
+            return best
+        return h
+
+# Cache de marcos por (mapa, modo, quantidade), recalculados quando o mapa muda
+_landmarks = weakref.WeakKeyDictionary()
+
+def landmarks_for(maze, is_dungeon=False, count=DEFAULT_LANDMARKS):
+    grid = as_grid(maze)
+    cache = _landmarks.setdefault(grid, {})
+    found = cache.get((is_dungeon, count))
+    if found is None or not found.is_valid(grid):
+        found = cache[(is_dungeon, count)] = Landmarks(grid, is_dungeon, count)
+    return found
+
+# Relatório de nós expandidos por heurística nos trechos da jornada com os mapas da pasta mapas/
+# (nas masmorras o JPS é desligado para comparar as heurísticas no mesmo A*)
+def expansion_report(map_folder="mapas"):
+    from main import load_scenario
+    from search import a_star_search
+    scenario = load_scenario(map_folder)
+    if not scenario: return
+    hyrule, dungeons, start_pos, lost_woods = scenario
+    entrances = [d[0] for d in dungeons]
+    legs = [(hyrule, a, b, False) for a in [start_pos] + entrances for b in entrances + [lost_woods] if a != b]
+    for _, dmap, dentrance, dping in dungeons:
+        legs += [(dmap, dentrance, dping, True), (dmap, dping, dentrance, True)]
+
+    modes = {
+        'manhattan': lambda m, d: {'h_scale': 1},
+        'manhattan_escalada': lambda m, d: {},
+        'alt': lambda m, d: {'landmarks': landmarks_for(m, d)},
+    }
+    totals = {name: {False: 0, True: 0} for name in modes}
+    for maze, a, b, is_dungeon in legs:
+        costs = set()
+        for name, options in modes.items():
+            stats = {}
+            _, cost = a_star_search(maze, a, b, is_dungeon, use_jps=False, stats=stats, **options(maze, is_dungeon))
+            totals[name][is_dungeon] += stats['expanded']
+            costs.add(cost)
+        assert len(costs) == 1, f"Custos diferentes entre heurísticas no trecho {a} -> {b}"
+
+    print(f"Nós expandidos em {len(legs)} trechos:")
+    print(f"  {'heurística':<20}{'Hyrule':>10}{'masmorras':>12}")
+    for name, total in totals.items():
+        print(f"  {name:<20}{total[False]:>10}{total[True]:>12}")
+
+if __name__ == "__main__":
+    expansion_report()
@@ -0,0 +1,237 @@
+import hashlib
+import heapq
+import os
+import numpy as np
+from grid import as_grid
+from search import a_star_search
+
+# Busca hierárquica (HPA*) para mapas grandes
+# O mapa é dividido em blocos (clusters) de cluster_size x cluster_size células.
+# Em cada fronteira entre blocos vizinhos, os trechos contínuos em que os dois lados são
+# transitáveis viram entradas (uma no meio do trecho, ou duas nas pontas se ele for longo,
+# mais a travessia mais barata do trecho).
+# O grafo abstrato tem um nó por célula de entrada, arestas entre os dois lados de cada
+# entrada e arestas entre as entradas de um mesmo bloco com o custo do melhor caminho
+# dentro do bloco. Tudo isso é calculado uma vez; a consulta liga início e fim às
+# entradas dos seus blocos, busca no grafo abstrato e refina só os trechos escolhidos.
+
+DEFAULT_CLUSTER_SIZE = 10
+# Trechos de fronteira a partir deste tamanho recebem duas entradas (uma em cada ponta)
+LONG_ENTRANCE = 6
+
+class Abstraction:
+    def __init__(self, maze, is_dungeon=False, cluster_size=DEFAULT_CLUSTER_SIZE, _data=None):
+        self.grid = as_grid(maze)
+        self.is_dungeon = is_dungeon
+        self.cluster_size = cluster_size
+        self.map_hash = map_hash(self.grid, is_dungeon)
+        if _data is None:
+            nodes, edges = self._build()
+        else:
+            nodes, edges = _data
+        # nodes: índices planos (matriz com borda) das células de entrada
+        self.nodes = [int(i) for i in nodes]
+        self.node_of = {idx: k for k, idx in enumerate(self.nodes)}
+        self.edges = [[] for _ in self.nodes]
+        for a, b, cost in edges:
+            self.edges[int(a)].append((int(b), int(cost)))
+        self.cluster_nodes = {}
+        for k, idx in enumerate(self.nodes):
+            self.cluster_nodes.setdefault(self.cluster_of(idx), []).append(k)
+
+    # Bloco de uma célula (índice plano) e seus limites 0-based [r0, r1) x [c0, c1)
+    def cluster_of(self, idx):
+        r, c = self.grid.position(idx)
+        return r // self.cluster_size, c // self.cluster_size
+
+    def cluster_bounds(self, cluster):
+        size = self.cluster_size
+        r0, c0 = cluster[0]*size, cluster[1]*size
+        return r0, min(r0+size, self.grid.rows), c0, min(c0+size, self.grid.cols)
+
+    # Dijkstra restrito a um bloco, a partir de uma célula
+    # reverse=True calcula o custo de cada célula até a origem (em vez da origem até ela)
+    def _local_dijkstra(self, source, cluster, reverse=False):
+        costs, wall = self.grid.flat_costs(self.is_dungeon)
+        width = self.grid.width
+        r0, r1, c0, c1 = self.cluster_bounds(cluster)
+        dist = {source: 0}
+        open_list = [(0, source)]
+        while open_list:
+            d, idx = heapq.heappop(open_list)
+            if d > dist[idx]: continue
+            if reverse:
+                if costs[idx] == wall: continue
+                step = costs[idx]
+            for nidx in (idx-width, idx+width, idx-1, idx+1):
+                r, c = divmod(nidx, width)
+                if not (r0 < r <= r1 and c0 < c <= c1) or costs[nidx] == wall: continue
+                nd = d + (step if reverse else costs[nidx])
+                if nd < dist.get(nidx, float('inf')):
+                    dist[nidx] = nd
+                    heapq.heappush(open_list, (nd, nidx))
+        return dist
+
+    def _build(self):
+        grid, size = self.grid, self.cluster_size
+        costs, wall = grid.flat_costs(self.is_dungeon)
+        nodes, node_of, edges = [], {}, []
+
+        def node(idx):
+            if idx not in node_of:
+                node_of[idx] = len(nodes)
+                nodes.append(idx)
+            return node_of[idx]
+
+        def add_entrances(cells):
+            # cells: pares (célula de um lado, célula do outro lado) ao longo da fronteira
+            segment = []
+            for a, b in cells + [(None, None)]:
+                if a is not None and costs[a] != wall and costs[b] != wall:
+                    segment.append((a, b))
+                    continue
+                if segment:
+                    picks = [segment[len(segment)//2]] if len(segment) < LONG_ENTRANCE else [segment[0], segment[-1]]
+                    # Em terreno com pesos, o ponto onde a travessia é mais barata importa
+                    cheapest = min(segment, key=lambda pair: costs[pair[0]] + costs[pair[1]])
+                    if cheapest not in picks: picks.append(cheapest)
+                    for pa, pb in picks:
+                        na, nb = node(pa), node(pb)
+                        edges.append((na, nb, costs[pb]))
+                        edges.append((nb, na, costs[pa]))
+                    segment = []
+
+        for cr in range(0, grid.rows, size):
+            for cc in range(0, grid.cols, size):
+                r1, c1 = min(cr+size, grid.rows), min(cc+size, grid.cols)
+                # Fronteira com o bloco de baixo e com o bloco da direita
+                if r1 < grid.rows:
+                    add_entrances([(grid.index(r1-1, c), grid.index(r1, c)) for c in range(cc, c1)])
+                if c1 < grid.cols:
+                    add_entrances([(grid.index(r, c1-1), grid.index(r, c1)) for r in range(cr, r1)])
+
+        # Arestas internas: melhor caminho dentro do bloco entre cada par de entradas
+        clusters = {}
+        for k, idx in enumerate(nodes):
+            r, c = grid.position(idx)
+            clusters.setdefault((r // size, c // size), []).append(k)
+        for cluster, members in clusters.items():
+            for a in members:
+                dist = self._local_dijkstra(nodes[a], cluster)
+                for b in members:
+                    if b != a and nodes[b] in dist:
+                        edges.append((a, b, dist[nodes[b]]))
+        return nodes, edges
+
+    # Salva a abstração em .npz, junto com o hash do mapa (e dos custos) para validar ao carregar
+    def save(self, file_path):
+        edges = [(a, b, cost) for a, out in enumerate(self.edges) for b, cost in out]
+        np.savez_compressed(file_path, nodes=np.array(self.nodes, dtype=np.int64),
+                            edges=np.array(edges, dtype=np.int64).reshape(-1, 3),
+                            cluster_size=self.cluster_size, is_dungeon=self.is_dungeon,
+                            map_hash=self.map_hash)
+
+    @classmethod
+    def load(cls, file_path, maze):
+        grid = as_grid(maze)
+        with np.load(file_path) as data:
+            if str(data['map_hash']) != map_hash(grid, bool(data['is_dungeon'])):
+                raise ValueError(f"A abstração em {file_path} não corresponde a este mapa")
+            return cls(grid, bool(data['is_dungeon']), int(data['cluster_size']),
+                       _data=(data['nodes'].tolist(), data['edges'].tolist()))
+
+    # Busca no grafo abstrato; retorna a sequência de células (índices planos) e o custo
+    def _abstract_path(self, start_idx, end_idx):
+        costs, wall = self.grid.flat_costs(self.is_dungeon)
+        start_cluster, end_cluster = self.cluster_of(start_idx), self.cluster_of(end_idx)
+        # Custos a partir do início dentro de cada bloco alcançado: {bloco: {célula: custo}}
+        # Como no A*, dá para sair de um início em parede; os vizinhos dele em outros blocos não
+        # são entradas (a fronteira ali não é transitável dos dois lados), então entram direto
+        seeds = [(start_cluster, self._local_dijkstra(start_idx, start_cluster))]
+        if costs[start_idx] == wall:
+            width = self.grid.width
+            for n in (start_idx-width, start_idx+width, start_idx-1, start_idx+1):
+                cluster = self.cluster_of(n)
+                r, c = self.grid.position(n)
+                if cluster == start_cluster or costs[n] == wall or not (0 <= r < self.grid.rows and 0 <= c < self.grid.cols):
+                    continue
+                seeds.append((cluster, {idx: costs[n] + d for idx, d in self._local_dijkstra(n, cluster).items()}))
+        to_end = self._local_dijkstra(end_idx, end_cluster, reverse=True)
+        # Nós temporários: -1 = início, -2 = fim
+        best = {-1: 0}
+        parent = {-1: None}
+        open_list = [(0, -1)]
+        direct = min((dist[end_idx] for cluster, dist in seeds if cluster == end_cluster and end_idx in dist), default=None)
+        if direct is not None:
+            best[-2] = direct
+            parent[-2] = -1
+            heapq.heappush(open_list, (best[-2], -2))
+        while open_list:
+            d, k = heapq.heappop(open_list)
+            if d > best[k]: continue
+            if k == -2: break
+            if k == -1:
+                out = [(n, dist[self.nodes[n]]) for cluster, dist in seeds for n in self.cluster_nodes.get(cluster, [])
+                       if self.nodes[n] in dist]
+            else:
+                out = list(self.edges[k])
+                if self.nodes[k] in to_end and self.cluster_of(self.nodes[k]) == end_cluster:
+                    out.append((-2, to_end[self.nodes[k]]))
+            for n, cost in out:
+                if d + cost < best.get(n, float('inf')):
+                    best[n] = d + cost
+                    parent[n] = k
+                    heapq.heappush(open_list, (d + cost, n))
+        if -2 not in best: return None, float('inf')
+        cells, k = [], -2
+        while k is not None:
+            cells.append(end_idx if k == -2 else start_idx if k == -1 else self.nodes[k])
+            k = parent[k]
+        return cells[::-1], best[-2]
+
+    # Consulta (início/fim 1-based) no mesmo contrato de a_star_search: (caminho 0-based, custo)
+    # exact=True resolve com a_star_search no mapa inteiro (ótimo garantido); sem ele o
+    # resultado é o caminho hierárquico refinado, quase ótimo.
+    def search(self, start, end, exact=False):
+        if exact:
+            return a_star_search(self.grid, start, end, self.is_dungeon)
+        grid = self.grid
+        start_idx = grid.index(start[0]-1, start[1]-1)
+        end_idx = grid.index(end[0]-1, end[1]-1)
+        if start_idx == end_idx: return [grid.position(start_idx)], 0
+        cells, _ = self._abstract_path(start_idx, end_idx)
+        if cells is None: return None, float('inf')
+        # Refinamento: cada trecho entre células consecutivas é curto (dentro de um bloco
+        # ou atravessando uma entrada) e é resolvido com a_star_search
+        path, total = [grid.position(cells[0])], 0
+        for a, b in zip(cells, cells[1:]):
+            (ar, ac), (br, bc) = grid.position(a), grid.position(b)
+            piece, cost = a_star_search(grid, (ar+1, ac+1), (br+1, bc+1), self.is_dungeon)
+            if piece is None: return None, float('inf')
+            path += piece[1:]
+            total += cost
+        return path, total
+
+# Hash do mapa e da tabela de custos do modo: a abstração guarda custos dentro dos blocos,
+# então uma mudança em TERRAIN_COSTS também a invalida
+def map_hash(grid, is_dungeon=False):
+    table = hashlib.sha256(grid.cost_lut(is_dungeon).tobytes()).hexdigest()
+    return f"{grid.content_hash()}:{table}"
+
+# Arquivo da abstração salvo ao lado do mapa (ex.: mapas/hyrule.txt -> mapas/hyrule.hpa.npz)
+def abstraction_path(map_path):
+    return os.path.splitext(map_path)[0] + ".hpa.npz"
+
+# Carrega a abstração salva com o mapa ou, se não existir ou estiver desatualizada, constrói e salva
+def load_abstraction(map_path, maze, is_dungeon=False, cluster_size=DEFAULT_CLUSTER_SIZE):
+    file_path = abstraction_path(map_path)
+    if os.path.exists(file_path):
+        try:
+            abstraction = Abstraction.load(file_path, maze)
+            if abstraction.is_dungeon == is_dungeon and abstraction.cluster_size == cluster_size:
+                return abstraction
+        except (ValueError, KeyError, OSError):
+            pass
+    abstraction = Abstraction(maze, is_dungeon, cluster_size)
+    abstraction.save(file_path)
+    return abstraction
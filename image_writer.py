@@ -0,0 +1,121 @@
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, ImageDraw
+from grid import as_grid
+from render import base_image, fits_canvas, render_path, get_font
+
+# Gravação assíncrona das imagens da jornada
+# Desenhar e codificar PNG acontece num pool de threads limitado (a compressão zlib do
+# PIL libera o GIL), enquanto a thread principal continua as buscas. submit() bloqueia
+# quando há max_pending imagens na fila, para limitar a memória; flush() espera todas.
+# Modos de saída:
+#   'files'         um PNG por trecho (comportamento original)
+#   'multiframe'    um único arquivo com um quadro por trecho (ex.: .png animado, .tif, .gif)
+#   'contact_sheet' uma única imagem com miniaturas de todos os trechos lado a lado
+# trace (instrumentation.Trace): registra o tempo de desenho e de codificação de cada imagem
+# verbose: mostra o nome de cada arquivo gravado; as mensagens saem no flush(), na thread que
+# chama e na ordem dos submit, só depois que o arquivo existe
+
+MODES = ('files', 'multiframe', 'contact_sheet')
+
+class ImageWriter:
+    def __init__(self, workers=2, max_pending=None, compress_level=6, mode='files', output=None,
+                 thumb_size=(400, 400), trace=None, verbose=True):
+        if mode not in MODES:
+            raise ValueError(f"Modo de saída desconhecido: {mode}")
+        if mode != 'files' and not output:
+            raise ValueError(f"O modo {mode} precisa do arquivo de saída (output)")
+        self.mode = mode
+        self.output = output
+        self.compress_level = compress_level
+        self.thumb_size = thumb_size
+        self.trace = trace
+        self.verbose = verbose
+        self._pool = ThreadPoolExecutor(workers)
+        self._slots = threading.BoundedSemaphore(max_pending or 2*workers)
+        self._futures = []
+        self._frames = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def submit(self, maze, path, filename, is_dungeon=False, cell_size=20):
+        grid = as_grid(maze)
+        # A imagem base é montada (ou buscada no cache) aqui, na thread que chama
+        if fits_canvas(grid.rows, grid.cols, cell_size): base_image(grid, is_dungeon, cell_size)
+        self._slots.acquire()
+        future = self._pool.submit(self._work, len(self._futures), grid, path, filename, is_dungeon, cell_size)
+        future.add_done_callback(lambda _: self._slots.release())
+        self._futures.append(future)
+
+    def _work(self, order, grid, path, filename, is_dungeon, cell_size):
+        started = time.perf_counter()
+        img = render_path(grid, path, is_dungeon, cell_size)
+        rendered = time.perf_counter()
+        if self.mode == 'files':
+            img.save(filename, compress_level=self.compress_level)
+        else:
+            if self.mode == 'contact_sheet':
+                img.thumbnail(self.thumb_size)
+            self._frames[order] = (filename, img)
+        if self.trace:
+            self.trace.record('image', filename=filename, render_time=rendered-started,
+                              encode_time=time.perf_counter()-rendered)
+        return filename
+
+    # Espera todas as imagens pendentes e grava o arquivo único (modos multiframe/contact_sheet)
+    def flush(self):
+        futures, self._futures = self._futures, []
+        for future in futures:
+            filename = future.result()
+            if self.mode == 'files' and self.verbose: print(f"Mapa visual salvo em: {filename}")
+        if not self._frames: return
+        frames = [self._frames[k] for k in sorted(self._frames)]
+        self._frames = {}
+        started = time.perf_counter()
+        if self.mode == 'multiframe':
+            self._save_multiframe([img for _, img in frames])
+        else:
+            self._save_contact_sheet(frames)
+        if self.trace:
+            self.trace.record('image', filename=self.output, render_time=0, encode_time=time.perf_counter()-started)
+        if self.verbose: print(f"Imagens da jornada salvas em: {self.output}")
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self._pool.shutdown()
+
+    def _save_multiframe(self, images):
+        # Quadros de tamanhos diferentes (Hyrule e masmorras) são completados com branco
+        width = max(img.width for img in images)
+        height = max(img.height for img in images)
+        padded = []
+        for img in images:
+            if img.size != (width, height):
+                canvas = Image.new("RGB", (width, height), (255, 255, 255))
+                canvas.paste(img, (0, 0))
+                img = canvas
+            padded.append(img)
+        padded[0].save(self.output, save_all=True, append_images=padded[1:], compress_level=self.compress_level)
+
+    def _save_contact_sheet(self, frames):
+        font = get_font()
+        tw, th = self.thumb_size
+        caption = 20
+        columns = math.ceil(math.sqrt(len(frames)))
+        rows = math.ceil(len(frames) / columns)
+        sheet = Image.new("RGB", (columns*tw, rows*(th+caption)), (255, 255, 255))
+        draw = ImageDraw.Draw(sheet)
+        for k, (filename, img) in enumerate(frames):
+            x, y = (k % columns)*tw, (k // columns)*(th+caption)
+            sheet.paste(img, (x + (tw-img.width)//2, y))
+            draw.text((x+4, y+th+2), os.path.basename(filename), fill=(0, 0, 0), font=font)
+        sheet.save(self.output, compress_level=self.compress_level)
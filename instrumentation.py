@@ -0,0 +1,63 @@
+import json
+import threading
+
+# Instrumentação opcional das buscas e da jornada
+# Buscas: a_star_search(..., stats={}) preenche o dicionário com o algoritmo usado, nós
+# expandidos, nós empilhados, maior tamanho da lista aberta, empilhamentos repetidos (a
+# mesma célula empilhada de novo com custo menor) e o tempo de parede.
+# Jornada: um Trace recebe um registro por evento (trecho, imagem, ordem, jornada) com os
+# tempos de busca e de desenho separados; opcionalmente grava cada registro como uma linha
+# JSON em um arquivo. Sem Trace/stats nada é medido, então dá para deixar ligado em produção.
+
+# Contadores de uma busca com fila de prioridade com remoção preguiçosa
+# Toda entrada empilhada ou foi retirada (expandida ou descartada por estar desatualizada)
+# ou ainda está na fila; as células distintas empilhadas são as que têm g conhecido.
+def search_counts(expanded, stale, open_size, reached, max_open):
+    pushed = expanded + stale + open_size
+    return {'expanded': expanded, 'pushed': pushed, 'max_open': max_open, 'duplicates': pushed - reached}
+
+class Trace:
+    def __init__(self, file_path=None):
+        self.records = []
+        self._lock = threading.Lock()
+        self._file = open(file_path, 'a') if file_path else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Guarda um registro {'event': ..., campos...}; pode ser chamado de várias threads
+    def record(self, event, **fields):
+        entry = {'event': event, **fields}
+        with self._lock:
+            self.records.append(entry)
+            if self._file:
+                self._file.write(json.dumps(entry, default=str) + '\n')
+                self._file.flush()
+        return entry
+
+    def events(self, event):
+        return [r for r in self.records if r['event'] == event]
+
+    # Totais por tipo de evento: quantidade e soma de cada campo numérico terminado em _time
+    def summary(self):
+        totals = {}
+        for r in self.records:
+            total = totals.setdefault(r['event'], {'count': 0})
+            total['count'] += 1
+            for key, value in r.items():
+                if key.endswith('_time') and isinstance(value, (int, float)):
+                    total[key] = total.get(key, 0) + value
+        return totals
+
+    # Trechos mais lentos (tempo de busca + tempo de desenho na thread da jornada)
+    def slowest_legs(self, count=5):
+        legs = self.events('leg')
+        return sorted(legs, key=lambda r: r['search_time'] + r.get('render_time', 0), reverse=True)[:count]
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,90 @@
+import heapq
+from grid import as_grid
+from instrumentation import search_counts
+
+# Jump Point Search para mapas de custo uniforme com 4 vizinhos (masmorras)
+# Em vez de empilhar cada célula, a busca "salta" em linha reta e só para em pontos
+# de salto: o objetivo ou células onde um caminho ótimo pode precisar virar.
+# Ordem canônica: movimentos horizontais podem virar para cima/baixo em qualquer
+# célula (os saltos verticais são testados a cada passo do salto horizontal);
+# movimentos verticais só viram para o lado quando há vizinho forçado, isto é,
+# a lateral está livre mas a lateral da célula anterior é parede.
+# Os índices são os índices planos da matriz com borda do Grid (a borda é parede).
+
+def jps_search(maze, start, end, is_dungeon=False, stats=None):
+    grid = as_grid(maze)
+    costs, wall = grid.flat_costs(is_dungeon)
+    step_cost = grid.uniform_cost(is_dungeon)
+    if step_cost is None:
+        raise ValueError("Jump Point Search exige mapa de custo uniforme")
+    width = grid.width
+    er, ec = end[0], end[1]
+    start_idx = grid.index(start[0]-1, start[1]-1)
+    end_idx = grid.index(end[0]-1, end[1]-1)
+
+    def jump_vertical(i, d):
+        while True:
+            i += d
+            if costs[i] == wall: return -1
+            if i == end_idx: return i
+            b = i - d
+            if (costs[i+1] != wall and costs[b+1] == wall) or (costs[i-1] != wall and costs[b-1] == wall):
+                return i
+
+    def jump_horizontal(i, d):
+        while True:
+            i += d
+            if costs[i] == wall: return -1
+            if i == end_idx: return i
+            if jump_vertical(i, width) != -1 or jump_vertical(i, -width) != -1: return i
+
+    # Direções a explorar a partir de um ponto de salto, dada a direção de chegada
+    def directions(i, d):
+        if d == 0: return (1, -1, width, -width)
+        if d == 1 or d == -1: return (d, width, -width)
+        b = i - d
+        return [d] + [side for side in (1, -1) if costs[i+side] != wall and costs[b+side] == wall]
+
+    best_g = {start_idx: 0}
+    parent = {start_idx: -1}
+    h0 = (abs(start[0]-er) + abs(start[1]-ec)) * step_cost
+    open_list = [(h0, h0, start_idx, 0, 0)]
+    # Contadores como no A* (instrumentation.search_counts); cada ponto de salto retirado é uma expansão
+    expanded = stale = max_open = 0
+    track = stats is not None
+
+    while open_list:
+        _, _, idx, g, d = heapq.heappop(open_list)
+        if g > best_g[idx]:
+            stale += 1
+            continue
+        expanded += 1
+
+        if idx == end_idx:
+            # Reconstrói o caminho célula a célula entre pontos de salto consecutivos
+            jumps = []
+            while idx != -1:
+                jumps.append(idx)
+                idx = parent[idx]
+            jumps.reverse()
+            path = [grid.position(jumps[0])]
+            for a, b in zip(jumps, jumps[1:]):
+                step = (1 if b > a else -1) * (1 if abs(b-a) < width else width)
+                path += [grid.position(k) for k in range(a+step, b+step, step)]
+            if track: stats.update(search_counts(expanded, stale, len(open_list), len(best_g), max_open))
+            return path, g
+
+        for nd in directions(idx, d):
+            nidx = jump_horizontal(idx, nd) if nd == 1 or nd == -1 else jump_vertical(idx, nd)
+            if nidx == -1: continue
+            new_g = g + (abs(nidx-idx) // abs(nd)) * step_cost
+            if new_g >= best_g.get(nidx, float('inf')): continue
+            best_g[nidx] = new_g
+            parent[nidx] = idx
+            nx, ny = divmod(nidx, width)
+            h = (abs(nx-er) + abs(ny-ec)) * step_cost
+            heapq.heappush(open_list, (new_g + h, h, nidx, new_g, nd))
+        if track and len(open_list) > max_open: max_open = len(open_list)
+
+    if track: stats.update(search_counts(expanded, stale, 0, len(best_g), max_open))
+    return None, float('inf')
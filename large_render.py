@@ -0,0 +1,143 @@
+import math
+import os
+import struct
+import zlib
+import numpy as np
+from grid import as_grid
+from render import MAX_PIXELS, color_lut, PATH_COLOR, GRID_COLOR
+
+# Desenho de mapas muito grandes com memória limitada
+# A imagem é montada por faixas de linhas de células direto da matriz de letras (tabela de
+# cores + ampliação), sem a tela inteira na memória:
+#  - plot_large_map escolhe o tamanho da célula (ou quantas células por pixel) para caber em
+#    max_pixels e grava o PNG faixa por faixa (codificador PNG próprio, com zlib incremental);
+#  - margin desenha só o retângulo que envolve o caminho, com essa folga em células;
+#  - write_tile_pyramid grava uma pirâmide de blocos PNG (pasta/z/x/y.png) para visualização
+#    com zoom; cada bloco é desenhado sozinho, então a memória é a de um bloco.
+# Quando várias células viram um pixel, vale a cor da primeira célula do bloco e o pixel fica
+# com a cor do caminho se alguma célula do caminho cair nele. Não há rótulos de linha/coluna;
+# as linhas da grade só aparecem com células de 4 pixels ou mais.
+
+STRIP_PIXELS = 1 << 22
+TILE_SIZE = 256
+
+# (pixels por célula, células por pixel) para que a região caiba em max_pixels
+def fit_scale(rows, cols, max_pixels=MAX_PIXELS, cell_size=20):
+    cell_size = min(cell_size, int(math.sqrt(max_pixels / (rows*cols))))
+    if cell_size >= 1: return cell_size, 1
+    return 1, math.ceil(math.sqrt(rows*cols / max_pixels))
+
+# Retângulo de células [r0, r1) x [c0, c1) (0-based) que envolve o caminho, com folga
+def path_bounds(path, rows, cols, margin=0):
+    if not path: return 0, rows, 0, cols
+    pr, pc = zip(*path)
+    return max(0, min(pr)-margin), min(rows, max(pr)+margin+1), max(0, min(pc)-margin), min(cols, max(pc)+margin+1)
+
+def _path_arrays(path):
+    cells = np.array(path if path else np.empty((0, 2)), dtype=np.int64).reshape(-1, 2)
+    order = np.argsort(cells[:, 0], kind='stable')
+    return cells[order, 0], cells[order, 1]
+
+# Pixels das células [r0, r1) x [c0, c1), com step células por pixel ou cell_size pixels por célula
+# path_rows/path_cols: células do caminho ordenadas por linha (ver _path_arrays)
+def render_cells(grid, is_dungeon, r0, r1, c0, c1, cell_size=1, step=1, path_rows=None, path_cols=None, lut=None):
+    lut = color_lut(is_dungeon) if lut is None else lut
+    pixels = lut[grid.terrain()[r0:r1:step, c0:c1:step]]
+    if path_rows is not None and path_rows.size:
+        lo, hi = np.searchsorted(path_rows, [r0, r1])
+        pr, pc = path_rows[lo:hi], path_cols[lo:hi]
+        inside = (pc >= c0) & (pc < c1)
+        pixels[(pr[inside]-r0) // step, (pc[inside]-c0) // step] = PATH_COLOR
+    if cell_size > 1:
+        pixels = pixels.repeat(cell_size, axis=0).repeat(cell_size, axis=1)
+        if cell_size >= 4:
+            pixels[::cell_size] = GRID_COLOR
+            pixels[:, ::cell_size] = GRID_COLOR
+    return pixels
+
+# Faixas (linhas de pixels) da região, cada uma com até ~STRIP_PIXELS pixels
+def _strips(grid, path, is_dungeon, region, cell_size, step):
+    r0, r1, c0, c1 = region
+    path_rows, path_cols = _path_arrays(path)
+    lut = color_lut(is_dungeon)
+    width = -(-(c1-c0) // step) * cell_size
+    rows_per_strip = max(1, STRIP_PIXELS // (width * cell_size)) * step
+    for top in range(r0, r1, rows_per_strip):
+        yield render_cells(grid, is_dungeon, top, min(r1, top+rows_per_strip), c0, c1, cell_size, step,
+                           path_rows, path_cols, lut)
+
+# Imagem inteira (NumPy) já reduzida para caber em max_pixels
+def render_large(maze, path, is_dungeon=False, max_pixels=MAX_PIXELS, margin=None):
+    grid = as_grid(maze)
+    region = path_bounds(path, grid.rows, grid.cols, margin) if margin is not None else (0, grid.rows, 0, grid.cols)
+    cell_size, step = fit_scale(region[1]-region[0], region[3]-region[2], max_pixels)
+    return np.concatenate(list(_strips(grid, path, is_dungeon, region, cell_size, step)))
+
+# Gravação de PNG RGB linha a linha: só a faixa atual e o estado do zlib ficam na memória
+class PngStream:
+    def __init__(self, file_path, width, height, compress_level=6):
+        self.width = width
+        self._file = open(file_path, 'wb')
+        self._file.write(b'\x89PNG\r\n\x1a\n')
+        self._chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+        self._zlib = zlib.compressobj(compress_level)
+
+    def _chunk(self, kind, data):
+        self._file.write(struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data)))
+
+    def write(self, pixels):
+        rows = np.zeros((pixels.shape[0], 1 + self.width*3), dtype=np.uint8)
+        rows[:, 1:] = pixels.reshape(pixels.shape[0], -1)
+        data = self._zlib.compress(rows.tobytes())
+        if data: self._chunk(b'IDAT', data)
+
+    def close(self):
+        self._chunk(b'IDAT', self._zlib.flush())
+        self._chunk(b'IEND', b'')
+        self._file.close()
+
+# PNG de um mapa de qualquer tamanho com no máximo max_pixels (margin: só em volta do caminho)
+def plot_large_map(maze, path, filename, is_dungeon=False, max_pixels=MAX_PIXELS, margin=None, compress_level=6,
+                   verbose=True):
+    grid = as_grid(maze)
+    region = path_bounds(path, grid.rows, grid.cols, margin) if margin is not None else (0, grid.rows, 0, grid.cols)
+    r0, r1, c0, c1 = region
+    cell_size, step = fit_scale(r1-r0, c1-c0, max_pixels)
+    height, width = -(-(r1-r0) // step) * cell_size, -(-(c1-c0) // step) * cell_size
+    png = PngStream(filename, width, height, compress_level)
+    try:
+        for strip in _strips(grid, path, is_dungeon, region, cell_size, step):
+            png.write(strip)
+    finally:
+        png.close()
+    if verbose: print(f"Mapa visual salvo em: {filename}")
+    return cell_size, step
+
+# Pirâmide de blocos tile_size x tile_size em folder/z/x/y.png
+# No nível mais alto cada célula tem cell_size pixels (potência de 2); cada nível abaixo tem
+# a metade da resolução e o nível 0 cabe em um bloco. Devolve o nível mais alto.
+def write_tile_pyramid(maze, path, folder, is_dungeon=False, cell_size=16, tile_size=TILE_SIZE, verbose=True):
+    from PIL import Image
+    grid = as_grid(maze)
+    if cell_size & (cell_size-1) or tile_size % cell_size:
+        raise ValueError("cell_size deve ser potência de 2 e dividir tile_size")
+    path_rows, path_cols = _path_arrays(path)
+    lut = color_lut(is_dungeon)
+    side = max(grid.rows, grid.cols) * cell_size
+    top = max(0, math.ceil(math.log2(side / tile_size)))
+    for z in range(top, -1, -1):
+        scale = 2 ** (top - z)
+        # Células por bloco neste nível: tile_size / pixels por célula
+        size, step = (cell_size // scale, 1) if scale <= cell_size else (1, scale // cell_size)
+        cells = tile_size // size * step
+        # Cada linha de blocos é uma faixa; os blocos são desenhados um a um
+        for y in range(-(-grid.rows // cells)):
+            for x in range(-(-grid.cols // cells)):
+                r0, c0 = y*cells, x*cells
+                pixels = render_cells(grid, is_dungeon, r0, min(grid.rows, r0+cells), c0, min(grid.cols, c0+cells),
+                                      size, step, path_rows, path_cols, lut)
+                tile_folder = os.path.join(folder, str(z), str(x))
+                os.makedirs(tile_folder, exist_ok=True)
+                Image.fromarray(pixels).save(os.path.join(tile_folder, f"{y}.png"))
+    if verbose: print(f"Pirâmide de blocos ({top+1} níveis) salva em: {folder}")
+    return top
@@ -0,0 +1,93 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from service_client import DEFAULT_PORT, ServiceClient
+
+# Teste de carga do serviço de caminhos (service.py, que precisa estar rodando)
+# Abre várias conexões e, em cada uma, mantém até `depth` pedidos em andamento. As consultas
+# são sorteadas de um conjunto de `distinct` pares de pontos, então a taxa de acertos no
+# cache do serviço depende de distinct e do total de pedidos.
+# Uso: python load_test.py --pedidos 20000 --conexoes 8 --profundidade 16 [--socket /tmp/iatp.sock]
+
+# Consultas sorteadas: pares de células transitáveis (vizinhas de pontos de passagem) de cada mapa
+def make_queries(maps, distinct, seed=0):
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(distinct):
+        name = rng.choice(sorted(maps))
+        info = maps[name]
+        points = list(info['waypoints'].values())
+        (sr, sc), (er, ec) = rng.sample(points, 2)
+        jitter = lambda v, top: min(top, max(1, v + rng.randint(-1, 1)))
+        start = [jitter(sr, info['rows']), jitter(sc, info['cols'])]
+        end = [jitter(er, info['rows']), jitter(ec, info['cols'])]
+        queries.append({'op': 'path', 'map': name, 'start': start, 'end': end})
+    return queries
+
+async def _connection(open_connection, queries, count, depth, latencies, rng):
+    reader, writer = await open_connection()
+    sent_at = {}
+    window = asyncio.Semaphore(depth)
+
+    async def receive():
+        for _ in range(count):
+            reply = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - sent_at.pop(reply['id']))
+            window.release()
+
+    receiver = asyncio.create_task(receive())
+    for k in range(count):
+        await window.acquire()
+        sent_at[k] = time.perf_counter()
+        writer.write(json.dumps({'id': k, **rng.choice(queries)}).encode() + b'\n')
+        if k % depth == depth - 1: await writer.drain()
+    await writer.drain()
+    await receiver
+    writer.close()
+
+async def run_load(open_connection, queries, total, connections, depth, seed=0):
+    latencies = []
+    per_connection = total // connections
+    started = time.perf_counter()
+    await asyncio.gather(*(_connection(open_connection, queries, per_connection, depth, latencies, random.Random(seed + k))
+                           for k in range(connections)))
+    return latencies, time.perf_counter() - started
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered)-1, int(fraction * len(ordered)))]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Teste de carga do serviço de caminhos")
+    parser.add_argument('--socket', help="socket Unix do serviço (padrão: TCP)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--pedidos', type=int, default=10000)
+    parser.add_argument('--conexoes', type=int, default=4)
+    parser.add_argument('--profundidade', type=int, default=16, help="pedidos em andamento por conexão")
+    parser.add_argument('--distintos', type=int, default=200, help="consultas diferentes sorteadas")
+    parser.add_argument('--semente', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with ServiceClient(args.socket, args.host, args.porta) as client:
+        queries = make_queries(client.request('maps')['maps'], args.distintos, args.semente)
+        before = client.stats()
+    if args.socket:
+        open_connection = lambda: asyncio.open_unix_connection(args.socket)
+    else:
+        open_connection = lambda: asyncio.open_connection(args.host, args.porta)
+    latencies, elapsed = asyncio.run(run_load(open_connection, queries, args.pedidos, args.conexoes,
+                                              args.profundidade, args.semente))
+    with ServiceClient(args.socket, args.host, args.porta) as client:
+        after = client.stats()
+
+    print(f"{len(latencies)} pedidos em {elapsed:.2f} s: {len(latencies)/elapsed:.0f} pedidos/s")
+    print(f"Latência (ms): p50 {percentile(latencies, 0.5)*1000:.2f}  p95 {percentile(latencies, 0.95)*1000:.2f}"
+          f"  p99 {percentile(latencies, 0.99)*1000:.2f}  máx {max(latencies)*1000:.2f}")
+    delta = {key: after[key] - before[key] for key in ('cache_hits', 'coalesced', 'computed', 'errors')}
+    print("Serviço: " + ', '.join(f"{key} {value}" for key, value in delta.items()))
+
+if __name__ == "__main__":
+    main()
@@ -1,213 +1,234 @@
-import heapq
+import argparse
+import json
 import os
-import itertools
-from PIL import Image, ImageDraw, ImageFont
-
-# --- Parâmetros e Configurações ---
-TERRAIN_COSTS = {
-    'G': 10, 'A': 20, 'F': 100, 'M': 150, 'W': 180,
-    'S': 10, 'X': 20, 'Y': 20, 'Z': 20, 'L': 10
-}
-
-DUNGEON_PATH_COST = 10
-DUNGEON_WALL = '#'
-
-# Cores
-aSTAR_COLORS = {
-    'M': (147, 141, 83), 'A': (195, 187, 149), 'W': (82, 140, 212),
-    'F': (3, 174, 81), 'G': (148, 205, 74), 'X': (0, 0, 0), 'Y': (0, 0, 0),
-    'Z': (0, 0, 0), 'S': (255, 0, 0), 'L': (255, 0, 255)
-}
-
-DUNGEON_COLORS = {
-    '#': (183, 183, 183), '.': (225, 225, 225), 'E': (0, 255, 0), 'P': (255, 0, 0)
-}
-
-PATH_COLOR = (255, 255, 255)
-GRID_COLOR = (120, 120, 120)
-
-# Classe que representa cada nó (célula) do mapa
-class Node:
-    def __init__(self, position, parent=None):
-        self.position = position # (linha, coluna)
-        self.parent = parent     # nó pai, usado para reconstruir o caminho
-        self.g = 0               # custo acumulado até aqui
-        self.h = 0               # heurística (distância estimada até o objetivo)
-        self.f = 0               # f = g + h
-    def __lt__(self, other):
-        return self.f < other.f
-
-# Lê o mapa de um arquivo de texto e cria a matriz
-# Cada linha do arquivo vira uma lista de caracteres
-def load_map(file_path):
-    maze = []
-    try:
-        with open(file_path, 'r') as file:
-            for line in file:
-                cleaned_line = line.strip().replace(' ', '')
-                if cleaned_line:
-                    maze.append(list(cleaned_line))
-    except FileNotFoundError:
-        print(f"Erro: Arquivo {file_path} não encontrado.")
-        return None
-    return maze
-
-# Função heurística (distância de Manhattan) - (Admissível porque nunca superestima o custo real)
-def heuristic(a, b):
-    return abs(a[0] - b[0]) + abs(a[1] - b[1])
-
-# Implementação da busca A*
-def a_star_search(maze, start, end, is_dungeon=False):
-    if not maze: return None, float('inf')
-
-    # Ajuste para usar índices (linha-1, coluna-1) (lista em python começa com 0)
-    start_indexed = (start[0]-1, start[1]-1)
-    end_indexed = (end[0]-1, end[1]-1)
-
-    # open_list = nós a serem explorados (fila de prioridade), closed_list = nós já visitados
-    open_list, closed_list = [], set()
-    # Nós de início e fim
-    start_node, end_node = Node(start_indexed), Node(end_indexed)
-    # Insere o nó inicial na fila de prioridade
-    heapq.heappush(open_list, start_node)
-
-    while open_list:
-        # Pega o nó com menor f = g + h
-        current = heapq.heappop(open_list)
-        closed_list.add(current.position)
-
-        # Se chegamos no destino, reconstruímos o caminho
-        if current.position == end_node.position:
-            path, node = [], current
-            while node:
-                path.append(node.position)
-                node = node.parent
-            return path[::-1], current.g
-        (x, y) = current.position
-
-        # Expande vizinhos (N, S, L, O)
-        for nx, ny in [(x-1,y),(x+1,y),(x,y-1),(x,y+1)]:
-            if not (0 <= nx < len(maze) and 0 <= ny < len(maze[0])):
-                continue
-
-            # Calcula custo do vizinho dependendo do tipo de mapa
-            if is_dungeon:
-                if maze[nx][ny] == DUNGEON_WALL: continue
-                cost = DUNGEON_PATH_COST
-            else:
-                terrain = maze[nx][ny]
-                cost = TERRAIN_COSTS.get(terrain, float('inf'))
-                if cost == float('inf'): continue
-            
-            # Cria nó vizinho
-            neighbor = Node((nx,ny), current)
-            # Se já visitado, ignora
-            if neighbor.position in closed_list: continue
-
-            # Calcula novo custo acumulado g
-            new_g = current.g + cost
-
-            # Se já existe um nó igual na open_list com g menor, ignora
-            if any(n.position==neighbor.position and new_g>=n.g for n in open_list):
-                continue
-
-            # Atualiza valores g, h e f do vizinho
-            neighbor.g = new_g
-            neighbor.h = heuristic(neighbor.position, end_node.position)
-            neighbor.f = neighbor.g + neighbor.h
-
-            # Adiciona vizinho à lista de exploração
-            heapq.heappush(open_list, neighbor)
-
-    return None, float('inf')
-
-def text_size(draw, text, font):
-    try:
-        bbox = draw.textbbox((0,0), text, font=font)
-        return bbox[2]-bbox[0], bbox[3]-bbox[1]
-    except AttributeError:
-        return draw.textsize(text, font=font)
-
-def plot_path_on_map(maze, path, filename, is_dungeon=False, cell_size=20):
-    rows, cols = len(maze), len(maze[0])
-    try: font = ImageFont.truetype("arial.ttf",14)
-    except: font = ImageFont.load_default()
-    tmp_img = Image.new("RGB",(10,10))
-    tmp_draw = ImageDraw.Draw(tmp_img)
-    label_w,label_h = text_size(tmp_draw,str(max(rows,cols)),font)
-    label_space = max(label_w,label_h)+8
-    img = Image.new("RGB", (label_space+cols*cell_size+1,label_space+rows*cell_size+1),(255,255,255))
-    draw = ImageDraw.Draw(img)
-    for c in range(cols):
-        txt=str(c+1); tw,th=text_size(draw,txt,font)
-        x=label_space+c*cell_size+(cell_size-tw)/2; y=(label_space-th)/2
-        draw.text((x,y),txt,fill=(0,0,0),font=font)
-    for r in range(rows):
-        txt=str(r+1); tw,th=text_size(draw,txt,font)
-        x=(label_space-tw)/2; y=label_space+r*cell_size+(cell_size-th)/2
-        draw.text((x,y),txt,fill=(0,0,0),font=font)
-    colors = DUNGEON_COLORS if is_dungeon else aSTAR_COLORS
-    for r in range(rows):
-        for c in range(cols):
-            color=colors.get(maze[r][c],(0,0,0))
-            x0=label_space+c*cell_size; y0=label_space+r*cell_size
-            draw.rectangle([x0,y0,x0+cell_size,y0+cell_size],fill=color,outline=GRID_COLOR)
-    for x,y in path:
-        x0=label_space+y*cell_size; y0=label_space+x*cell_size
-        draw.rectangle([x0,y0,x0+cell_size,y0+cell_size],fill=PATH_COLOR)
-    draw.rectangle([label_space,label_space,label_space+cols*cell_size,label_space+rows*cell_size],outline=(0,0,0),width=2)
-    img.save(filename)
-    print(f"Mapa visual salvo em: {filename}")
+import time
+from grid import Grid, as_grid, load_map, TERRAIN_COSTS, DUNGEON_PATH_COST, DUNGEON_WALL
+from search import heuristic, a_star_search
+from order_solver import choose_solver, solve_order
+from parallel import run_searches
+from path_cache import PathCache
+from map_format import load_scenario_map
+from instrumentation import Trace
+
+# O PIL só é importado quando alguma imagem é pedida: os nomes de desenho que este módulo
+# sempre exportou (render.py) e o ImageWriter são carregados no primeiro acesso
+_RENDER_NAMES = ('aSTAR_COLORS', 'DUNGEON_COLORS', 'PATH_COLOR', 'GRID_COLOR', 'text_size', 'plot_path_on_map')
+
+def __getattr__(name):
+    if name in _RENDER_NAMES:
+        import render
+        return getattr(render, name)
+    if name == 'ImageWriter':
+        from image_writer import ImageWriter
+        return ImageWriter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Cache persistente dos trechos calculados (reaproveitado enquanto os mapas não mudam)
+PATH_CACHE_FILE = os.path.join(".cache", "caminhos.sqlite")
+
+# Pré-cálculo de todos os trechos da jornada que não dependem da ordem das masmorras
+# Pontos de passagem: 0 = início, k+1 = entrada da masmorra k, n+1 = Lost Woods
+# costs[i][j]/paths[i][j] guardam o trecho em Hyrule do ponto i ao ponto j e
+# dungeon_legs[k] a ida (entrada -> pingente) e a volta (pingente -> entrada) na masmorra k.
+# São O(n²) buscas no total, em vez de O(n!·n) refazendo os mesmos trechos a cada ordem.
+class JourneyLegs:
+    # trace (instrumentation.Trace): registra cada busca feita e o tempo total do pré-cálculo
+    # weight: estimativa rápida para escolher a ordem. Os trechos em Hyrule (os únicos que
+    # dependem da ordem) vêm da primeira solução do ARA* com esse peso (custo <= weight × ótimo)
+    # e só os da ordem escolhida são refeitos exatamente por refine(order). Os trechos dentro
+    # das masmorras entram em qualquer ordem e são sempre exatos.
+    def __init__(self, hyrule_map, dungeons, start_pos, lost_woods, workers=1, cache=None, trace=None, weight=None):
+        if trace: started = time.perf_counter()
+        n = len(dungeons)
+        self.waypoints = [start_pos] + [d[0] for d in dungeons] + [lost_woods]
+        self.costs = [[float('inf')]*(n+2) for _ in range(n+2)]
+        self.paths = [[None]*(n+2) for _ in range(n+2)]
+        # Mapa 0 = Hyrule, mapa k+1 = masmorra k
+        self.maps = [hyrule_map] + [d[1] for d in dungeons]
+        self.workers, self.cache, self.trace = workers, cache, trace
+        self.cache_hits = 0
+        # Trechos em Hyrule: saindo do início ou de uma entrada, chegando numa entrada ou em Lost Woods
+        pairs = [(i, j) for i in range(n+1) for j in range(1, n+2) if i != j]
+        tasks = [(0, self.waypoints[i], self.waypoints[j], False) for i, j in pairs]
+        # Ida e volta dentro de cada masmorra
+        for k, (_, _, dentrance, dping) in enumerate(dungeons):
+            tasks += [(k+1, dentrance, dping, True), (k+1, dping, dentrance, True)]
+        if weight is None:
+            results, estimated = self._search(tasks)
+        else:
+            results, estimated = self._search(tasks[:len(pairs)], weight)
+            results += self._search(tasks[len(pairs):])[0]
+        for (i, j), (path, cost) in zip(pairs, results):
+            self.paths[i][j], self.costs[i][j] = path, cost
+        # Trechos em Hyrule com custo estimado (ainda não refeitos exatamente)
+        self.estimated = {pairs[k] for k in estimated}
+        rest = results[len(pairs):]
+        self.dungeon_points = [(d[2], d[3]) for d in dungeons]
+        self.dungeon_legs = [(rest[2*k], rest[2*k+1]) for k in range(n)]
+        self.dungeon_costs = [going[1] + back[1] for going, back in self.dungeon_legs]
+        if trace:
+            trace.record('legs', tasks=len(tasks), cache_hits=self.cache_hits, workers=workers,
+                         estimated=len(self.estimated), wall_time=time.perf_counter()-started)
+
+    # Resultados (caminho, custo) de buscas independentes: (índice do mapa, início, fim, is_dungeon)
+    # Trechos já guardados no cache (PathCache) não são buscados de novo; com weight as buscas
+    # são estimativas e não vão para o cache. Devolve também os índices das tarefas estimadas.
+    def _search(self, tasks, weight=None):
+        cache, trace = self.cache, self.trace
+        results = [cache.get(self.maps[m], s, e, d) if cache else None for m, s, e, d in tasks]
+        missing = [t for t, r in zip(tasks, results) if r is None]
+        self.cache_hits += len(tasks) - len(missing)
+        # workers > 1 distribui as buscas num pool de processos (mesmo resultado da execução serial)
+        found = iter(run_searches(self.maps, missing, self.workers, with_stats=bool(trace), weight=weight))
+        estimated = []
+        for k, task in enumerate(tasks):
+            if results[k] is None:
+                results[k] = next(found)
+                if trace:
+                    *results[k], stats = results[k]
+                    trace.record('search', map=task[0], start=task[1], end=task[2], dungeon=task[3], cost=results[k][1], **stats)
+                if weight is not None: estimated.append(k)
+                elif cache: cache.put(self.maps[task[0]], *task[1:], *results[k])
+        return results, estimated
+
+    # Refaz exatamente os trechos estimados que a ordem usa; depois disso journey_cost(order)
+    # e route(order) são exatos. Devolve quantos trechos foram refeitos.
+    def refine(self, order):
+        if self.trace: started = time.perf_counter()
+        stops = [0] + [idx+1 for idx in order] + [len(self.waypoints)-1]
+        pairs = [(i, j) for i, j in zip(stops, stops[1:]) if (i, j) in self.estimated]
+        results, _ = self._search([(0, self.waypoints[i], self.waypoints[j], False) for i, j in pairs])
+        for (i, j), (path, cost) in zip(pairs, results):
+            self.paths[i][j], self.costs[i][j] = path, cost
+            self.estimated.discard((i, j))
+        if self.trace:
+            self.trace.record('refine', order=list(order), legs=len(pairs), wall_time=time.perf_counter()-started)
+        return len(pairs)
+
+    # Custo total de uma ordem usando só os valores pré-calculados
+    def journey_cost(self, order):
+        total, current = 0, 0
+        for idx in order:
+            total += self.costs[current][idx+1] + self.dungeon_costs[idx]
+            current = idx+1
+        return total + self.costs[current][len(self.waypoints)-1]
+
+    # Trechos da jornada na ordem dada: [(mapa, início, fim, caminho, custo)], mapa 0 = Hyrule e k+1 = masmorra k
+    def route(self, order):
+        legs, current, last = [], 0, len(self.waypoints)-1
+        for idx in order:
+            legs.append((0, self.waypoints[current], self.waypoints[idx+1], self.paths[current][idx+1], self.costs[current][idx+1]))
+            entrance, pendant = self.dungeon_points[idx]
+            going, back = self.dungeon_legs[idx]
+            legs += [(idx+1, entrance, pendant, *going), (idx+1, pendant, entrance, *back)]
+            current = idx+1
+        legs.append((0, self.waypoints[current], self.waypoints[last], self.paths[current][last], self.costs[current][last]))
+        return legs
+
+    # Matriz para o order_solver: custo de ir do ponto i ao ponto j somado à ida e volta na masmorra j
+    def order_matrix(self):
+        n = len(self.dungeon_costs)
+        return [[cost + (self.dungeon_costs[j-1] if 1 <= j <= n else 0) for j, cost in enumerate(row)]
+                for row in self.costs]
 
 # Função que simula toda a jornada do Link
-# Testa todas as ordens possíveis das masmorras e calcula o custo total
-def simulate_journey(order, hyrule_map, dungeons, start_pos, lost_woods, save_images=True):
+# Percorre as masmorras na ordem dada e calcula o custo total
+# Se legs (JourneyLegs) for passado, os trechos vêm do pré-cálculo em vez de novas buscas;
+# trechos estimados (JourneyLegs com weight) da ordem são refeitos exatamente antes
+# As imagens são gravadas em segundo plano pelo writer (ImageWriter); sem writer, um
+# gravador padrão (um PNG por trecho) é criado e todas as imagens terminam antes do retorno
+# trace (instrumentation.Trace): registra cada trecho (tempo de busca, tempo gasto com a
+# imagem na thread da jornada e contadores da busca) e a jornada inteira
+# verbose: mostra o progresso da jornada (padrão: o mesmo que save_images)
+# image_folder: pasta das imagens dos trechos (precisa existir)
+def simulate_journey(order, hyrule_map, dungeons, start_pos, lost_woods, save_images=True, legs=None, writer=None,
+                     trace=None, verbose=None, image_folder="percurso"):
+    if verbose is None: verbose = save_images
+    if legs and legs.estimated: legs.refine(order)
+    own_writer = save_images and writer is None
+    if own_writer:
+        from image_writer import ImageWriter
+        writer = ImageWriter(trace=trace)
+    if trace: started, first = time.perf_counter(), len(trace.records)
+    cost = float('inf')
+    try:
+        cost = _journey_steps(order, hyrule_map, dungeons, start_pos, lost_woods, save_images, legs, writer, trace, verbose,
+                              image_folder)
+        return cost
+    finally:
+        if trace: flushing = time.perf_counter()
+        if own_writer: writer.close()
+        elif save_images: writer.flush()
+        if trace:
+            done = time.perf_counter()
+            steps = [r for r in trace.records[first:] if r['event'] == 'leg']
+            trace.record('journey', order=list(order), cost=cost, legs=len(steps),
+                         search_time=sum(r['search_time'] for r in steps),
+                         render_time=sum(r['render_time'] for r in steps) + done - flushing,
+                         wall_time=done - started)
+
+def _journey_steps(order, hyrule_map, dungeons, start_pos, lost_woods, save_images, legs, writer, trace, verbose,
+                   image_folder):
     total_cost=0; current=start_pos; step=1
-    if save_images:
+    waypoint=0
+    # Um trecho: busca (ou caminho pré-calculado), imagem e registro no trace
+    def leg(maze, a, b, is_dungeon, filename, precomputed=None):
+        stats = {} if trace else None
+        if trace: started = time.perf_counter()
+        path,cost = precomputed if precomputed is not None else a_star_search(maze,a,b,is_dungeon,stats=stats)
+        if trace: searched = time.perf_counter()
+        if path and save_images: writer.submit(maze,path,filename,is_dungeon)
+        if trace:
+            stats.pop('wall_time',None)
+            trace.record('leg',step=step,start=a,end=b,dungeon=is_dungeon,cost=cost,precomputed=precomputed is not None,
+                         search_time=searched-started,render_time=time.perf_counter()-searched,**stats)
+        return path,cost
+    def hyrule_leg(goal, goal_waypoint):
+        precomputed = (legs.paths[waypoint][goal_waypoint], legs.costs[waypoint][goal_waypoint]) if legs else None
+        return leg(hyrule_map,current,goal,False,os.path.join(image_folder,f"hyrule_caminho_{step}.png"),precomputed)
+    if verbose:
         print("Iniciando a jornada de Link...")
     
     # Para cada masmorra na ordem escolhida
     for idx in order:
         hyrule_entrance, dmap, dentrance, dping = dungeons[idx]
         # Caminho até a entrada da masmorra
-        if save_images:
+        if verbose:
             print(f"\n--- Passo {step}: Indo para Masmorra com entrada em {hyrule_entrance} ---")
-        path,cost=a_star_search(hyrule_map,current,hyrule_entrance)
+        path,cost=hyrule_leg(hyrule_entrance,idx+1)
         if not path: return float('inf')
         total_cost+=cost
-        if save_images:
-            plot_path_on_map(hyrule_map,path,f"percurso/hyrule_caminho_{step}.png")
+        if verbose:
             print(f"Caminho no mapa principal (custo: {cost}):\nCusto acumulado: {total_cost}")
-        current=hyrule_entrance; step+=1
+        current=hyrule_entrance; waypoint=idx+1; step+=1
         # Caminho até o pingente dentro da masmorra
-        if save_images:
+        if verbose:
             print(f"\n--- Passo {step}: Explorando a Masmorra (indo ao Pingente em {dping}) ---")
-        path,cost=a_star_search(dmap,dentrance,dping,True)
+        path,cost=leg(dmap,dentrance,dping,True,os.path.join(image_folder,f"masmorra_{step-1}_pingente.png"),
+                      legs.dungeon_legs[idx][0] if legs else None)
         if not path: return float('inf')
         total_cost+=cost
-        if save_images:
-            plot_path_on_map(dmap,path,f"percurso/masmorra_{step-1}_pingente.png",True)
+        if verbose:
             print(f"Caminho dentro da Masmorra (custo: {cost}):\nCusto acumulado: {total_cost}")
         step+=1
         # Caminho de volta para a saída da masmorra
-        if save_images:
+        if verbose:
             print(f"\n--- Passo {step}: Voltando da Masmorra para a saída ({dentrance}) ---")
-        path,cost=a_star_search(dmap,dping,dentrance,True)
+        path,cost=leg(dmap,dping,dentrance,True,os.path.join(image_folder,f"masmorra_{step-2}_saida.png"),
+                      legs.dungeon_legs[idx][1] if legs else None)
         if not path: return float('inf')
         total_cost+=cost
-        if save_images:
-            plot_path_on_map(dmap,path,f"percurso/masmorra_{step-2}_saida.png",True)
+        if verbose:
             print(f"Caminho de volta na Masmorra (custo: {cost}):\nCusto acumulado: {total_cost}")
         step+=1
 
     # Caminho final até Lost Woods
-    if save_images:
+    if verbose:
         print(f"\n--- Passo {step}: Indo para Lost Woods em {lost_woods} ---")
-    path,cost=a_star_search(hyrule_map,current,lost_woods)
+    path,cost=hyrule_leg(lost_woods,len(dungeons)+1)
     if not path: return float('inf')
     total_cost+=cost
-    if save_images:
-        plot_path_on_map(hyrule_map,path,f"percurso/hyrule_caminho_{step}.png")
+    if verbose:
         print(f"Caminho final para Lost Woods (custo: {cost}):\nCusto acumulado: {total_cost}")
 
         print("\n------------------------------------")
@@ -215,32 +236,120 @@ def simulate_journey(order, hyrule_map, dungeons, start_pos, lost_woods, save_im
         print("------------------------------------")
     return total_cost
 
-def main():
-    map_folder="mapas"
-    hyrule=load_map(os.path.join(map_folder,"hyrule.txt"))
-    m1=load_map(os.path.join(map_folder,"masmorra1.txt"))
-    m2=load_map(os.path.join(map_folder,"masmorra2.txt"))
-    m3=load_map(os.path.join(map_folder,"masmorra3.txt"))
-    if not all([hyrule,m1,m2,m3]): return
-
-    start_pos=(28,25); lost_woods=(6,7)
-    dungeons=[((33,6),m1,(27,15),(4,14)),((18,40),m2,(26,14),(3,14)),((2,25),m3,(26,15),(20,16))]
-
-    best_cost=float('inf'); best_order=None
-    # Testa todas as ordens possíveis de visitar as masmorras
-    for perm in itertools.permutations(range(3)):
-        cost=simulate_journey(perm,hyrule,dungeons,start_pos,lost_woods,save_images=False)
-        print(f"Ordem {perm} -> custo total: {cost}")
-        if cost<best_cost:
-            best_cost=cost; best_order=perm
-
-    # Executa a melhor ordem com prints e salvando imagens
-    simulate_journey(best_order,hyrule,dungeons,start_pos,lost_woods,save_images=True)
-    print(f"\nMelhor ordem de masmorras: {best_order}, custo total: {best_cost}")
+# Cenário padrão: mapas binários da pasta mapas/ (convertidos dos .txt quando preciso)
+# Os pontos de passagem vêm do cabeçalho dos mapas: início, Lost Woods e a entrada de cada
+# masmorra (masmorra1, masmorra2, ...) em Hyrule; entrada e pingente em cada masmorra.
+# Retorna (hyrule, dungeons, start_pos, lost_woods) ou None se faltar algum mapa
+# Cada masmorra é (entrada em Hyrule, mapa da masmorra, entrada na masmorra, pingente)
+def load_scenario(map_folder="mapas"):
+    hyrule=load_scenario_map(map_folder,"hyrule")
+    if not hyrule: return None
+    names=sorted((n for n in hyrule.waypoints if n.startswith("masmorra")),key=lambda n:int(n[len("masmorra"):]))
+    dungeons=[]
+    for name in names:
+        dmap=load_scenario_map(map_folder,name)
+        if not dmap: return None
+        dungeons.append((hyrule.waypoints[name],dmap,dmap.waypoints["entrada"],dmap.waypoints["pingente"]))
+    return hyrule,dungeons,hyrule.waypoints["inicio"],hyrule.waypoints["lost_woods"]
 
-if __name__=="__main__":
-    if not os.path.exists("mapas"):
-        print("Pasta 'mapas' não encontrada.")
-    else:
+# Arquivo único da jornada nos modos de imagem que juntam todos os trechos
+JOURNEY_IMAGE={'multiframe': os.path.join("percurso","jornada.png"), 'contact_sheet': os.path.join("percurso","jornada_resumo.png")}
+
+# Trechos da jornada na ordem escolhida, prontos para JSON (posições 1-based, caminhos 0-based)
+def journey_report(legs, order, cost, method=None):
+    names=['hyrule']+[f'masmorra{k+1}' for k in range(len(legs.dungeon_points))]
+    route=[{'map':names[m],'start':list(a),'end':list(b),'cost':c,'path':[list(p) for p in path] if path else None}
+           for m,a,b,path,c in legs.route(order)]
+    return {'method':method,'order':list(order),'cost':cost,'legs':route}
+
+# workers: número de processos para as buscas (None = todos os núcleos)
+# trace_file: grava a instrumentação (buscas, trechos, imagens, ordem) como linhas JSON;
+# o Trace com os mesmos registros é devolvido
+# render=False só calcula a ordem e os custos (sem PIL e sem imagens); as_json troca as
+# mensagens por um único JSON com a ordem, o custo e os trechos (journey_report)
+# start/end substituem o início e Lost Woods do cenário (linha, coluna 1-based)
+# estimate: peso do ARA* para escolher a ordem com custos estimados (JourneyLegs com weight);
+# o custo exato da ordem escolhida fica a no máximo estimate vezes o da melhor ordem
+def main(workers=1, image_mode='files', compress_level=6, trace_file=None, map_folder="mapas", render=True,
+         as_json=False, start=None, end=None, estimate=None):
+    scenario=load_scenario(map_folder)
+    if not scenario: return
+    hyrule,dungeons,start_pos,lost_woods=scenario
+    start_pos=tuple(start or start_pos); lost_woods=tuple(end or lost_woods)
+    for pos in (start_pos,lost_woods):
+        if not inside(hyrule,pos): raise ValueError(f"Posição {pos} fora do mapa de Hyrule ({hyrule.rows}x{hyrule.cols})")
+    trace=Trace(trace_file) if trace_file else None
+    verbose=not as_json
+
+    # Calcula uma única vez todos os trechos entre pontos de passagem
+    cache=PathCache(PATH_CACHE_FILE)
+    legs=JourneyLegs(hyrule,dungeons,start_pos,lost_woods,workers,cache,trace,estimate)
+
+    # Escolhe a melhor ordem de visita das masmorras só com a matriz de custos
+    method=choose_solver(len(dungeons))
+    if trace: started=time.perf_counter()
+    best_order,best_cost=solve_order(legs.order_matrix(),method)
+    if trace: trace.record('order',method=method,order=list(best_order),cost=best_cost,wall_time=time.perf_counter()-started)
+    # Com estimativa só os trechos da ordem escolhida são refeitos exatamente
+    if estimate is not None:
+        estimated_cost=best_cost
+        legs.refine(best_order)
+        best_cost=legs.journey_cost(best_order)
+    stats=cache.stats(); cache.close()
+    if verbose:
+        print(f"Cache de caminhos: {stats['hits']} acertos, {stats['misses']} faltas, {stats['evictions']} removidos")
+        print(f"Ordem calculada com {method}: {best_order} -> custo total: {best_cost}")
+        if estimate is not None:
+            print(f"Custo estimado com ARA* (peso {estimate}): {estimated_cost}; custo exato da ordem: {best_cost}")
+
+    # Executa a melhor ordem com prints e salvando imagens (reaproveitando os caminhos já calculados)
+    if render:
+        from image_writer import ImageWriter
         if not os.path.exists("percurso"): os.makedirs("percurso")
-        main()
+        with ImageWriter(compress_level=compress_level,mode=image_mode,output=JOURNEY_IMAGE.get(image_mode),trace=trace,
+                         verbose=verbose) as writer:
+            simulate_journey(best_order,hyrule,dungeons,start_pos,lost_woods,save_images=True,legs=legs,writer=writer,
+                             trace=trace,verbose=verbose)
+    if as_json:
+        print(json.dumps(journey_report(legs,best_order,best_cost,method)))
+    else:
+        print(f"\nMelhor ordem de masmorras: {best_order}, custo total: {best_cost}")
+    if trace: trace.close()
+    return trace
+
+def _position(text):
+    r,c=text.split(',')
+    return int(r),int(c)
+
+# Posição (linha, coluna 1-based) dentro do mapa
+def inside(grid,pos):
+    return 1<=pos[0]<=grid.rows and 1<=pos[1]<=grid.cols
+
+# Linha de comando; sem argumentos faz o mesmo de sempre (calcula, mostra e salva as imagens)
+def cli(argv=None):
+    parser=argparse.ArgumentParser(description="Melhor ordem das masmorras da jornada de Link")
+    parser.add_argument('--mapas',default="mapas",help="pasta do cenário (hyrule e masmorras)")
+    parser.add_argument('--inicio',type=_position,help="início em Hyrule: linha,coluna (padrão: o do mapa)")
+    parser.add_argument('--destino',type=_position,help="destino final (Lost Woods): linha,coluna")
+    parser.add_argument('--resolver',action='store_true',help="só calcula a ordem e os custos, sem imagens")
+    parser.add_argument('--estimativa',type=float,metavar='PESO',
+                        help="escolhe a ordem com custos do ARA* (até PESO vezes o ótimo) e refaz exatamente só a ordem escolhida")
+    parser.add_argument('--json',action='store_true',help="saída em JSON (ordem, custo e trechos com caminhos)")
+    parser.add_argument('--processos',type=int,default=1,help="processos para as buscas (0 = todos os núcleos)")
+    parser.add_argument('--imagens',choices=('files','multiframe','contact_sheet'),default='files')
+    parser.add_argument('--compressao',type=int,default=6,help="nível de compressão dos PNG (0-9)")
+    parser.add_argument('--trace',help="arquivo JSON-lines com a instrumentação")
+    args=parser.parse_args(argv)
+    if not os.path.exists(args.mapas):
+        print(f"Pasta '{args.mapas}' não encontrada.")
+        return 1
+    # Posições fora do mapa cairiam na borda ou fora da matriz (e iriam para o cache de caminhos)
+    hyrule=load_scenario_map(args.mapas,"hyrule")
+    for option,pos in (('--inicio',args.inicio),('--destino',args.destino)):
+        if hyrule and pos and not inside(hyrule,pos):
+            parser.error(f"{option} {pos[0]},{pos[1]} fora do mapa de Hyrule ({hyrule.rows}x{hyrule.cols})")
+    main(args.processos or None,args.imagens,args.compressao,args.trace,args.mapas,not args.resolver,args.json,
+         args.inicio,args.destino,args.estimativa)
+
+if __name__=="__main__":
+    raise SystemExit(cli())
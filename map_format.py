@@ -0,0 +1,105 @@
+import glob
+import json
+import os
+import struct
+import sys
+import numpy as np
+from grid import Grid, load_map
+
+# Formato binário de mapa (.map)
+#   [MAGIC, 8 bytes][tamanho do cabeçalho: uint32 little-endian][cabeçalho JSON + espaços]
+#   [células: (linhas+2) x (colunas+2) uint8, já com a borda, começando em múltiplo de ALIGN]
+# O cabeçalho guarda as dimensões, o modo (Hyrule ou masmorra), a legenda (letra -> custo,
+# null para parede) e os pontos de passagem nomeados (linha, coluna 1-based). own_costs diz se
+# o mapa tem custos próprios (Grid.legends): só então, ao abrir, a legenda vale como custos do
+# Grid no modo gravado. Nos mapas convertidos dos .txt ela é só informativa e os custos vêm de
+# TERRAIN_COSTS, então mudar a tabela (e reset_costs) continua valendo para eles.
+# Abrir um mapa só lê o cabeçalho: as células são um numpy.memmap em modo cópia-na-escrita,
+# então vários processos compartilham as mesmas páginas do cache do sistema e só quem
+# alterar o mapa (set_cells) ganha uma cópia das páginas alteradas.
+
+MAGIC = b'IATPMAP1'
+ALIGN = 64
+MAP_EXTENSION = '.map'
+
+# Letras dos mapas de texto que marcam pontos de passagem
+HYRULE_MARKERS = {'X': 'masmorra1', 'Y': 'masmorra2', 'Z': 'masmorra3', 'L': 'lost_woods', 'S': 'espada'}
+DUNGEON_MARKERS = {'E': 'entrada', 'P': 'pingente'}
+# Pontos de passagem sem marcador no texto, por nome do mapa
+EXTRA_WAYPOINTS = {'hyrule': {'inicio': (28, 25)}}
+
+# Legenda das letras presentes no mapa: custo de entrar em cada uma (None = parede)
+def map_legend(grid, is_dungeon=False):
+    lut = grid.cost_lut(is_dungeon)
+    wall = np.iinfo(lut.dtype).max
+    return {chr(code): (None if lut[code] == wall else int(lut[code])) for code in np.unique(grid.terrain()).tolist()}
+
+def save_map(grid, file_path, is_dungeon=False, waypoints=None):
+    points = dict(grid.waypoints)
+    points.update(waypoints or {})
+    header = json.dumps({
+        'rows': grid.rows, 'cols': grid.cols, 'dungeon': is_dungeon,
+        'legend': map_legend(grid, is_dungeon), 'own_costs': is_dungeon in grid.legends,
+        'waypoints': {name: list(map(int, pos)) for name, pos in points.items()},
+    }).encode('utf-8')
+    header += b' ' * (-(len(MAGIC) + 4 + len(header)) % ALIGN)
+    with open(file_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<I', len(header)))
+        f.write(header)
+        grid.cells.tofile(f)
+
+# Lê só o cabeçalho: devolve (cabeçalho, posição das células no arquivo)
+def read_header(file_path):
+    with open(file_path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{file_path} não é um mapa binário")
+        size, = struct.unpack('<I', f.read(4))
+        header = json.loads(f.read(size))
+    return header, len(MAGIC) + 4 + size
+
+# Abre um mapa binário como Grid (sem ler as células); None se o arquivo não existir
+def open_map(file_path):
+    if not os.path.exists(file_path):
+        print(f"Erro: Arquivo {file_path} não encontrado.")
+        return None
+    header, offset = read_header(file_path)
+    cells = np.memmap(file_path, dtype=np.uint8, mode='c', offset=offset, shape=(header['rows']+2, header['cols']+2))
+    waypoints = {name: tuple(pos) for name, pos in header['waypoints'].items()}
+    legends = {header['dungeon']: header['legend']} if header.get('own_costs') else None
+    return Grid(cells, padded=True, waypoints=waypoints, legends=legends)
+
+# Pontos de passagem marcados por letras no mapa ({nome: (linha, coluna) 1-based})
+def find_markers(grid, markers):
+    found = {}
+    for letter, name in markers.items():
+        rows, cols = np.nonzero(grid.terrain() == ord(letter))
+        if rows.size: found[name] = (int(rows[0])+1, int(cols[0])+1)
+    return found
+
+# Converte um mapa de texto para o formato binário
+# Os pontos de passagem vêm das letras marcadoras e de EXTRA_WAYPOINTS (pelo nome do arquivo)
+def convert_text_map(txt_path, out_path=None, is_dungeon=None):
+    name = os.path.splitext(os.path.basename(txt_path))[0]
+    if is_dungeon is None: is_dungeon = name.startswith('masmorra')
+    grid = load_map(txt_path)
+    if grid is None: return None
+    waypoints = find_markers(grid, DUNGEON_MARKERS if is_dungeon else HYRULE_MARKERS)
+    waypoints.update(EXTRA_WAYPOINTS.get(name, {}))
+    out_path = out_path or os.path.splitext(txt_path)[0] + MAP_EXTENSION
+    save_map(grid, out_path, is_dungeon, waypoints)
+    return out_path
+
+# Abre mapas/<nome>.map, convertendo antes o .txt se o binário não existir ou estiver desatualizado
+def load_scenario_map(map_folder, name):
+    txt_path = os.path.join(map_folder, name + '.txt')
+    bin_path = os.path.join(map_folder, name + MAP_EXTENSION)
+    if os.path.exists(txt_path) and (not os.path.exists(bin_path) or os.path.getmtime(txt_path) > os.path.getmtime(bin_path)):
+        convert_text_map(txt_path, bin_path)
+    return open_map(bin_path)
+
+if __name__ == "__main__":
+    # Converte todos os mapas de texto da pasta (padrão: mapas/)
+    folder = sys.argv[1] if len(sys.argv) > 1 else "mapas"
+    for txt_path in sorted(glob.glob(os.path.join(folder, '*.txt'))):
+        print(f"{txt_path} -> {convert_text_map(txt_path)}")
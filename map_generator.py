@@ -0,0 +1,72 @@
+import numpy as np
+from grid import Grid
+
+# Gerador de mapas sintéticos (com semente) para os benchmarks
+# Hyrule: terreno com custos variados a partir de um ruído suave (soma de oitavas de
+# ruído grosso ampliado), dividido em faixas de água, areia, grama, floresta e montanha.
+# Masmorra: labirinto de paredes '#' e caminhos '.' nas células de coordenadas ímpares,
+# gerado pelo algoritmo da árvore binária (cada célula abre para o norte ou para o leste,
+# tudo vetorizado) com algumas paredes extras removidas para criar ciclos.
+
+# Letras do terreno de Hyrule em ordem crescente de altura e a fração de cada uma
+HYRULE_BANDS = (('W', 0.12), ('A', 0.10), ('G', 0.40), ('F', 0.23), ('M', 0.15))
+
+def _smooth_noise(size, rng, octaves=4, base=8):
+    noise = np.zeros((size, size))
+    for octave in range(octaves):
+        step = max(1, size // (base * 2**octave))
+        coarse = rng.random((size // step + 2, size // step + 2))
+        # Ampliação bilinear do ruído grosso
+        pos = np.arange(size) / step
+        i, f = pos.astype(int), pos - pos.astype(int)
+        rows = coarse[i] * (1-f)[:, None] + coarse[i+1] * f[:, None]
+        noise += (rows[:, i] * (1-f) + rows[:, i+1] * f) / 2**octave
+    return noise
+
+def hyrule_map(size, seed=0):
+    rng = np.random.default_rng(seed)
+    noise = _smooth_noise(size, rng)
+    limits = np.quantile(noise, np.cumsum([share for _, share in HYRULE_BANDS])[:-1])
+    letters = np.frombuffer(''.join(letter for letter, _ in HYRULE_BANDS).encode('ascii'), dtype=np.uint8)
+    return Grid(letters[np.searchsorted(limits, noise)])
+
+def dungeon_map(size, seed=0, loops=0.05):
+    rng = np.random.default_rng(seed)
+    cells = np.full((size, size), ord('#'), dtype=np.uint8)
+    cells[1::2, 1::2] = ord('.')
+    rows, cols = np.mgrid[1:size:2, 1:size:2]
+    north = rng.random(rows.shape) < 0.5
+    # Primeira linha só abre para o leste e última coluna só para o norte
+    north[0, :] = False
+    north[:, -1] = True
+    north[0, -1] = False
+    open_north = north & (rows > 1)
+    open_east = ~north & (cols + 2 < size)
+    cells[rows[open_north]-1, cols[open_north]] = ord('.')
+    cells[rows[open_east], cols[open_east]+1] = ord('.')
+    # Ciclos: algumas paredes entre duas células de caminho são abertas
+    wall_r, wall_c = np.nonzero(cells[1:-1, 1:-1] == ord('#'))
+    wall_r, wall_c = wall_r+1, wall_c+1
+    between = ((wall_r % 2 == 1) & (wall_c % 2 == 0)) | ((wall_r % 2 == 0) & (wall_c % 2 == 1))
+    pick = between & (rng.random(wall_r.size) < loops)
+    cells[wall_r[pick], wall_c[pick]] = ord('.')
+    return Grid(cells)
+
+# Células transitáveis sorteadas (linha, coluna 1-based)
+def random_points(grid, count, seed=0, is_dungeon=False):
+    rng = np.random.default_rng(seed)
+    costs = grid.cost_array(is_dungeon)[1:-1, 1:-1]
+    rows, cols = np.nonzero(costs != np.iinfo(costs.dtype).max)
+    pick = rng.choice(rows.size, count, replace=False)
+    return [(int(rows[k])+1, int(cols[k])+1) for k in pick]
+
+# Cenário completo no formato de main.load_scenario: (hyrule, dungeons, start_pos, lost_woods)
+def synthetic_scenario(size, dungeon_size=None, dungeon_count=3, seed=0):
+    hyrule = hyrule_map(size, seed)
+    points = random_points(hyrule, dungeon_count + 2, seed)
+    dungeons = []
+    for k in range(dungeon_count):
+        dmap = dungeon_map(dungeon_size or max(16, size // 4), seed + k + 1)
+        entrance, pendant = random_points(dmap, 2, seed + k + 1, True)
+        dungeons.append((points[k+2], dmap, entrance, pendant))
+    return hyrule, dungeons, points[0], points[1]
@@ -0,0 +1,105 @@
+from PIL import Image
+import numpy as np
+
+# Conversão vetorizada de imagens de mapa em grades de letras
+# A imagem vira uma matriz NumPy e cada célula é o bloco [y0, y1) x [x0, x1), com os mesmos
+# limites dos conversores originais (i*tamanho//grid_size, recuados pela margem).
+# Cada bloco é resumido pela cor média (Hyrule) ou pela cor mais frequente (masmorras) e a
+# letra sai da cor de referência mais próxima, calculada de uma vez para todos os blocos.
+# palette = {letra: (r, g, b)}; em caso de empate vale a primeira cor da paleta.
+
+# Limites (início, fim) das células em um eixo; células vazias ganham ao menos um pixel
+def cell_bounds(size, grid_size, margin=0):
+    i = np.arange(grid_size)
+    start = i*size//grid_size + margin
+    end = (i+1)*size//grid_size - margin
+    end = np.where(end <= start, np.minimum(start+1, size), end)
+    return start, end
+
+# Cor média de cada bloco de uma faixa de linhas da imagem (altura da faixa x largura x 3)
+def block_means(strip, x0, x1):
+    sums = np.zeros((strip.shape[1]+1, 3), dtype=np.int64)
+    np.cumsum(strip.sum(axis=0, dtype=np.int64), axis=0, out=sums[1:])
+    return (sums[x1]-sums[x0]) / ((x1-x0)*strip.shape[0])[:, None]
+
+# Cor mais frequente de cada bloco da faixa
+# As cores são empacotadas em um inteiro (r<<16 | g<<8 | b) junto com o número do bloco e
+# contadas com np.unique; no empate vence a cor que aparece primeiro no bloco (como o Counter)
+def block_modes(strip, x0, x1):
+    owner = np.full(strip.shape[1], -1, dtype=np.int64)
+    for k, (a, b) in enumerate(zip(x0, x1)): owner[a:b] = k
+    inside = owner >= 0
+    pixels = strip[:, inside].astype(np.int64)
+    keys = (owner[inside] << 24) | (pixels[..., 0] << 16) | (pixels[..., 1] << 8) | pixels[..., 2]
+    values, first, counts = np.unique(keys.reshape(-1), return_index=True, return_counts=True)
+    blocks = values >> 24
+    order = np.lexsort((first, -counts, blocks))
+    best = order[np.unique(blocks[order], return_index=True)[1]]
+    packed = values[best] & 0xFFFFFF
+    return np.stack([packed >> 16, (packed >> 8) & 0xFF, packed & 0xFF], axis=1)
+
+# Letra da cor de referência mais próxima para cada cor (n x 3)
+def nearest_letters(colors, palette):
+    letters = np.array(list(palette))
+    refs = np.array(list(palette.values()), dtype=np.float64)
+    dist = ((np.asarray(colors, dtype=np.float64)[:, None, :] - refs[None, :, :])**2).sum(axis=2)
+    return letters[dist.argmin(axis=1)]
+
+SUMMARIES = {'mean': block_means, 'mode': block_modes}
+
+# Converte a matriz da imagem (altura x largura x 3) em uma lista de linhas de letras
+def classify(pixels, palette, grid_size, summary='mean', margin=0):
+    h, w = pixels.shape[:2]
+    y0, y1 = cell_bounds(h, grid_size, margin)
+    x0, x1 = cell_bounds(w, grid_size, margin)
+    summarize = SUMMARIES[summary]
+    return [''.join(nearest_letters(summarize(pixels[a:b], x0, x1), palette)) for a, b in zip(y0, y1)]
+
+# Matriz (linhas x largura x 3) mapeada direto do arquivo, sem decodificar a imagem inteira
+# Só funciona para imagens sem compressão gravadas em um único bloco RGB/BGR (PPM, BMP,
+# TIFF sem compressão); nos outros formatos devolve None
+def _raw_pixels(img):
+    if img.mode != 'RGB' or len(img.tile) != 1: return None
+    codec, extents, offset, args = img.tile[0]
+    if codec != 'raw' or tuple(extents) != (0, 0) + img.size: return None
+    rawmode, stride, orientation = (args, 0, 1) if isinstance(args, str) else (tuple(args) + (0, 1))[:3]
+    if rawmode not in ('RGB', 'BGR'): return None
+    w, h = img.size
+    data = np.memmap(img.filename, dtype=np.uint8, mode='r', offset=offset, shape=(h, stride or w*3))
+    pixels = data[:, :w*3].reshape(h, w, 3)
+    if orientation < 0: pixels = pixels[::-1]
+    return pixels[..., ::-1] if rawmode == 'BGR' else pixels
+
+# Lê a imagem em faixas horizontais, uma por linha da grade: devolve (limites x0, x1, faixas)
+# Nos formatos sem compressão as faixas saem do arquivo mapeado em memória, então o pico de
+# memória é o de uma faixa; nos outros a imagem é decodificada pelo PIL (uma vez, sem cópia
+# se já for RGB) e recortada por faixa.
+def read_strips(img_path, grid_size, margin=0):
+    img = Image.open(img_path)
+    w, h = img.size
+    y0, y1 = cell_bounds(h, grid_size, margin)
+    x0, x1 = cell_bounds(w, grid_size, margin)
+    pixels = _raw_pixels(img)
+    if pixels is not None:
+        strips = (np.ascontiguousarray(pixels[a:b]) for a, b in zip(y0, y1))
+    else:
+        if img.mode != 'RGB': img = img.convert('RGB')
+        strips = (np.asarray(img.crop((0, int(a), w, int(b)))) for a, b in zip(y0, y1))
+    return x0, x1, strips
+
+# Paleta {letra: cor} a partir das tabelas dos conversores (a ordem de sample_colors é mantida)
+def palette_from(sample_colors, terrain_to_letter):
+    return {terrain_to_letter[t]: cent for t, cent in sample_colors.items()}
+
+# Converte uma imagem em arquivo .txt e devolve a contagem de células por letra
+# Cada linha da grade é gravada assim que a sua faixa é classificada
+def convert_image(img_path, out_path, palette, grid_size, summary='mean', margin=0):
+    x0, x1, strips = read_strips(img_path, grid_size, margin)
+    summarize = SUMMARIES[summary]
+    counts = {letter: 0 for letter in palette}
+    with open(out_path, 'w') as f:
+        for strip in strips:
+            row = ''.join(nearest_letters(summarize(strip, x0, x1), palette))
+            f.write(row + '\n')
+            for letter in row: counts[letter] += 1
+    return counts
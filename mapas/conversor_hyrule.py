@@ -1,6 +1,4 @@
-from PIL import Image
-import numpy as np
-import math
+from conversor import convert_image, palette_from
 
 # Fiz alterações manuais no hyrule.txt para adicionar a espada 'S' de sword, e X, Y e Z referente a cada masmorra, além de L para lost woods
 # Valor exato RGB adquirido via extensão eye drop
@@ -20,54 +18,20 @@ terrain_to_letter = {
     'WATER': 'W'      # Água
 }
 
-def color_dist(a, b):
-    return math.sqrt((a[0]-b[0])**2 + (a[1]-b[1])**2 + (a[2]-b[2])**2)
-
 # --- parâmetros ---
 img_path = 'hyrule.jpg'
 grid_size = 42
+out_file = 'hyrule.txt'
 
-img = Image.open(img_path).convert('RGB')
-w, h = img.size
-
-rows = []
-counts = {k: 0 for k in sample_colors.keys()}
-
-for gy in range(grid_size):
-    y0 = (gy * h) // grid_size
-    y1 = ((gy + 1) * h) // grid_size
-    if y1 <= y0:
-        y1 = min(y0 + 1, h)
-
-    row_chars = []
-    for gx in range(grid_size):
-        x0 = (gx * w) // grid_size
-        x1 = ((gx + 1) * w) // grid_size
-        if x1 <= x0:
-            x1 = min(x0 + 1, w)
-
-        region = np.array(img.crop((x0, y0, x1, y1))).reshape(-1, 3)
-        avg = tuple(region.mean(axis=0))
-
-        best = None
-        bestd = float('inf')
-        for t, cent in sample_colors.items():
-            d = color_dist(avg, cent)
-            if d < bestd:
-                bestd = d
-                best = t
-
-        counts[best] += 1
-        row_chars.append(terrain_to_letter[best])
-
-    rows.append(''.join(row_chars))
+# Cada célula vira a cor média do bloco
+def converter_hyrule(img_path=img_path, out_path=out_file, grid_size=grid_size):
+    letter_counts = convert_image(img_path, out_path, palette_from(sample_colors, terrain_to_letter), grid_size, 'mean')
+    counts = {t: letter_counts[terrain_to_letter[t]] for t in sample_colors}
 
-out_file = 'hyrule.txt'
-with open(out_file, 'w') as f:
-    for r in rows:
-        f.write(r + '\n')
+    print("Arquivo salvo em:", out_path)
+    print("Contagem por terreno (células):")
+    for t, c in counts.items():
+        print(f"  {t}: {c}")
 
-print("Arquivo salvo em:", out_file)
-print("Contagem por terreno (células):")
-for t, c in counts.items():
-    print(f"  {t}: {c}")
+if __name__ == "__main__":
+    converter_hyrule()
@@ -0,0 +1,77 @@
+import argparse
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+from conversor import convert_image, palette_from
+import conversor_hyrule
+import conversor_masmorra
+
+# Conversão em lote: várias imagens (pastas ou padrões glob) convertidas em paralelo,
+# uma imagem por processo. Cada imagem é lida e classificada em faixas (uma linha da
+# grade por vez) e as linhas vão sendo gravadas no .txt. Nos formatos sem compressão
+# (PPM, BMP, TIFF) a imagem é mapeada em memória e a memória de cada processo não cresce com
+# o tamanho da imagem. JPEG e PNG (os scans comuns) precisam ser decodificados inteiros pelo
+# PIL: o pico fica em cerca de uma imagem decodificada (largura x altura x 3 bytes) por
+# processo, então com imagens muito grandes use menos --processos ou converta antes para PPM/BMP.
+# Uso: python conversor_lote.py scans/ "extra/*.png" --tipo masmorra --saida txt/ --processos 4
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.ppm', '.tif', '.tiff')
+
+PROFILES = {
+    'hyrule': {'palette': palette_from(conversor_hyrule.sample_colors, conversor_hyrule.terrain_to_letter),
+               'grid_size': conversor_hyrule.grid_size, 'summary': 'mean', 'margin': 0},
+    'masmorra': {'palette': palette_from(conversor_masmorra.sample_colors, conversor_masmorra.terrain_to_letter),
+                 'grid_size': 28, 'summary': 'mode', 'margin': 2},
+}
+
+# Lista as imagens de cada fonte (pasta ou padrão glob), sem repetir, em ordem alfabética
+def find_images(sources):
+    found = set()
+    for source in sources:
+        if os.path.isdir(source):
+            names = (os.path.join(source, name) for name in os.listdir(source))
+        else:
+            names = glob.glob(source)
+        found.update(n for n in names if os.path.isfile(n) and n.lower().endswith(IMAGE_EXTENSIONS))
+    return sorted(found)
+
+def _convert(task):
+    img_path, out_path, profile = task
+    return img_path, out_path, convert_image(img_path, out_path, **profile)
+
+# Converte as imagens em paralelo; cada .txt tem o nome da imagem e fica em out_dir
+# (ou ao lado da imagem). Devolve [(imagem, txt, contagem por letra)] na ordem das imagens.
+def convert_batch(images, profile, out_dir=None, workers=None):
+    if out_dir: os.makedirs(out_dir, exist_ok=True)
+    tasks = []
+    for img_path in images:
+        name = os.path.splitext(os.path.basename(img_path))[0] + '.txt'
+        tasks.append((img_path, os.path.join(out_dir or os.path.dirname(img_path), name), profile))
+    if workers == 1 or len(tasks) <= 1:
+        return [_convert(task) for task in tasks]
+    with ProcessPoolExecutor(workers) as pool:
+        return list(pool.map(_convert, tasks))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Converte imagens de mapas em arquivos .txt")
+    parser.add_argument('fontes', nargs='+', help="pastas ou padrões glob com as imagens")
+    parser.add_argument('--tipo', choices=sorted(PROFILES), default='masmorra', help="paleta e parâmetros do mapa")
+    parser.add_argument('--saida', help="pasta dos .txt (padrão: ao lado de cada imagem)")
+    parser.add_argument('--grade', type=int, help="células por lado (padrão do tipo)")
+    parser.add_argument('--margem', type=int, help="pixels ignorados na borda de cada célula (padrão do tipo)")
+    parser.add_argument('--processos', type=int, help="processos em paralelo (padrão: número de CPUs)")
+    args = parser.parse_args(argv)
+
+    profile = dict(PROFILES[args.tipo])
+    if args.grade: profile['grid_size'] = args.grade
+    if args.margem is not None: profile['margin'] = args.margem
+    images = find_images(args.fontes)
+    if not images:
+        print("Nenhuma imagem encontrada.")
+        return
+    for img_path, out_path, counts in convert_batch(images, profile, args.saida, args.processos):
+        summary = ', '.join(f"{letter}: {count}" for letter, count in counts.items())
+        print(f"{img_path} -> {out_path} ({summary})")
+
+if __name__ == "__main__":
+    main()
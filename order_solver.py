@@ -0,0 +1,152 @@
+import numpy as np
+
+# Escolha da ordem de visita das masmorras
+# Todos os resolvedores recebem uma matriz de custos (n+2)x(n+2) onde o ponto 0 é o
+# início, 1..n são as masmorras e n+1 é o destino final; matrix[i][j] é o custo de ir
+# de i até j já somado ao custo de visitar j. Retornam (ordem, custo), com a ordem
+# dada pelos índices 0-based das masmorras (ponto k+1 -> masmorra k).
+
+# Limite usado na escolha automática do resolvedor (número de masmorras)
+# Até 20 masmorras o Held-Karp vetorizado resolve em poucos segundos (~170 MB de tabela)
+HELD_KARP_MAX = 20
+
+# Custo total de uma ordem (índices 0-based das masmorras)
+def path_cost(matrix, order):
+    total, current = 0, 0
+    for idx in order:
+        total += matrix[current][idx+1]
+        current = idx+1
+    return total + matrix[current][len(matrix)-1]
+
+# Programação dinâmica de Held-Karp sobre subconjuntos: O(2^n·n²), exata
+# dp[mask, j] = menor custo saindo do início, visitando exatamente as masmorras de mask
+# e terminando na masmorra j. As camadas (masks com o mesmo número de bits) são
+# calculadas de forma vetorizada; a ordem é reconstruída refazendo o argmin de trás para frente.
+def held_karp(matrix):
+    n = len(matrix) - 2
+    if n == 0: return (), matrix[0][1]
+    cost = np.asarray(matrix, dtype=np.float64)
+    between, first, last = cost[1:n+1, 1:n+1], cost[0, 1:n+1], cost[1:n+1, n+1]
+
+    full = (1 << n) - 1
+    masks = np.arange(full+1)
+    bits = np.zeros(full+1, dtype=np.int64)
+    for j in range(n):
+        bits += (masks >> j) & 1
+    dp = np.full((full+1, n), np.inf)
+    for j in range(n):
+        dp[1 << j, j] = first[j]
+    for size in range(2, n+1):
+        layer = masks[bits == size]
+        for j in range(n):
+            sel = layer[(layer >> j) & 1 == 1]
+            dp[sel, j] = (dp[sel ^ (1 << j)] + between[:, j]).min(axis=1)
+
+    totals = dp[full] + last
+    j = int(np.argmin(totals))
+    # Nenhuma ordem completa possível (algum trecho sem caminho)
+    if np.isinf(totals[j]): return tuple(range(n)), float('inf')
+    order, mask = [j], full
+    while mask != 1 << j:
+        prev = mask ^ (1 << j)
+        i = int(np.argmin(dp[prev] + between[:, j]))
+        order.append(i)
+        mask, j = prev, i
+    order = tuple(order[::-1])
+    # Custo recalculado na matriz original (mantém os tipos de entrada, sem arredondamento)
+    return order, path_cost(matrix, order)
+
+# Limite inferior admissível: cada masmorra que falta (e o destino) ainda precisa ser
+# alcançada por uma aresta vinda do ponto atual ou de outra masmorra que falta
+def _lower_bound(matrix, current, remaining, end):
+    sources = [current] + remaining
+    bound = 0
+    for j in remaining + [end]:
+        bound += min((matrix[i][j] for i in sources if i != j), default=0)
+    return bound
+
+# Branch-and-bound em profundidade, exato
+# Começa com a solução da busca local como limite superior e corta todo ramo cujo
+# custo acumulado mais o limite inferior não possa melhorar a melhor ordem conhecida.
+# Também corta estados dominados: mesmo conjunto de masmorras restantes e mesma
+# masmorra atual já alcançados antes com custo menor ou igual.
+def branch_and_bound(matrix):
+    n = len(matrix) - 2
+    end = n+1
+    best_order, best_cost = local_search(matrix)
+    best = [best_cost, best_order]
+    seen = {}
+
+    def expand(current, g, visited, remaining):
+        if not remaining:
+            total = g + matrix[current][end]
+            if total < best[0]: best[0], best[1] = total, tuple(i-1 for i in visited)
+            return
+        # Filhos mais baratos primeiro para encontrar boas soluções cedo
+        for j in sorted(remaining, key=lambda k: matrix[current][k]):
+            new_g = g + matrix[current][j]
+            rest = [k for k in remaining if k != j]
+            state = (frozenset(rest), j)
+            if seen.get(state, float('inf')) <= new_g: continue
+            seen[state] = new_g
+            if new_g + _lower_bound(matrix, j, rest, end) >= best[0]: continue
+            visited.append(j)
+            expand(j, new_g, visited, rest)
+            visited.pop()
+
+    expand(0, 0, [], list(range(1, n+1)))
+    return best[1], best[0]
+
+# Busca local (heurística): vizinho mais próximo seguido de 2-opt e Or-opt até não melhorar
+# 2-opt inverte um trecho da ordem; Or-opt move blocos de 1 a 3 masmorras para outra posição
+def local_search(matrix, order=None):
+    n = len(matrix) - 2
+    if order is None:
+        order, current, remaining = [], 0, set(range(1, n+1))
+        while remaining:
+            nxt = min(remaining, key=lambda k: (matrix[current][k], k))
+            order.append(nxt-1); remaining.remove(nxt); current = nxt
+    order = list(order)
+    best = path_cost(matrix, order)
+
+    improved = True
+    while improved:
+        improved = False
+        # 2-opt
+        for i in range(n-1):
+            for k in range(i+1, n):
+                candidate = order[:i] + order[i:k+1][::-1] + order[k+1:]
+                cost = path_cost(matrix, candidate)
+                if cost < best:
+                    order, best, improved = candidate, cost, True
+        # Or-opt
+        for size in (1, 2, 3):
+            for i in range(n-size+1):
+                block, rest = order[i:i+size], order[:i] + order[i+size:]
+                for k in range(len(rest)+1):
+                    if k == i: continue
+                    candidate = rest[:k] + block + rest[k:]
+                    cost = path_cost(matrix, candidate)
+                    if cost < best:
+                        order, best, improved = candidate, cost, True
+                        break
+                else: continue
+                break
+    return tuple(order), best
+
+SOLVERS = {
+    'held_karp': held_karp,
+    'branch_and_bound': branch_and_bound,
+    'local_search': local_search,
+}
+
+# Escolhe o resolvedor pelo número de masmorras
+# O branch-and-bound fica disponível pelo parâmetro method: usa pouca memória, mas na
+# prática é mais lento que o Held-Karp em toda a faixa em que este cabe na memória
+def choose_solver(n):
+    if n <= HELD_KARP_MAX: return 'held_karp'
+    return 'local_search'
+
+def solve_order(matrix, method=None):
+    method = method or choose_solver(len(matrix) - 2)
+    return SOLVERS[method](matrix)
@@ -0,0 +1,61 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from grid import as_grid
+from search import a_star_search
+from anytime import anytime_search
+
+# Execução de várias buscas A* independentes em paralelo
+# Cada tarefa é (índice do mapa, início, fim, is_dungeon). Os mapas são entregues aos
+# processos uma única vez: com fork eles são herdados da memória do processo pai
+# (cópia sob demanda, sem serialização); sem fork vão uma vez por processo pelo
+# initializer. As tarefas levam só índices e coordenadas.
+# O A* é determinístico (empates decididos por (f, h, índice)) e os resultados voltam
+# na ordem das tarefas, então a saída é idêntica à execução serial.
+
+_maps = None
+
+def _init_worker(maps=None):
+    global _maps
+    if maps is not None:
+        _maps = maps
+
+# Com with_stats a busca devolve (caminho, custo, stats) com os contadores de a_star_search
+# weight: em vez da busca exata, a primeira solução do ARA* com esse peso (custo <= weight × ótimo)
+def _search(maze, start, end, is_dungeon, with_stats, weight=None):
+    stats = {} if with_stats else None
+    if weight is None:
+        path, cost = a_star_search(maze, start, end, is_dungeon, stats=stats)
+    else:
+        path, cost, _ = anytime_search(maze, start, end, is_dungeon, weight, max_expansions=0, stats=stats)
+    return (path, cost) if stats is None else (path, cost, stats)
+
+def _run_task(task):
+    map_idx, start, end, is_dungeon, with_stats, weight = task
+    return _search(_maps[map_idx], start, end, is_dungeon, with_stats, weight)
+
+def default_workers():
+    return os.cpu_count() or 1
+
+def run_searches(maps, tasks, workers=1, with_stats=False, weight=None):
+    global _maps
+    maps = [as_grid(m) for m in maps]
+    if workers is None: workers = default_workers()
+    workers = min(workers, len(tasks))
+    if workers <= 1:
+        return [_search(maps[m], s, e, d, with_stats, weight) for m, s, e, d in tasks]
+
+    # Custos calculados antes de criar os processos, para que todos herdem a mesma cópia
+    for m, _, _, d in tasks:
+        maps[m].cost_array(d)
+    if 'fork' in multiprocessing.get_all_start_methods():
+        context, initargs = multiprocessing.get_context('fork'), ()
+        _maps = maps
+    else:
+        context, initargs = multiprocessing.get_context(), (maps,)
+    try:
+        with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker, initargs=initargs) as pool:
+            chunksize = max(1, len(tasks) // (workers * 4))
+            return list(pool.map(_run_task, [task + (with_stats, weight) for task in tasks], chunksize=chunksize))
+    finally:
+        _maps = None
@@ -0,0 +1,121 @@
+import hashlib
+import os
+import sqlite3
+from grid import as_grid
+from search import a_star_search
+
+# Cache persistente de caminhos (SQLite)
+# Chave: (hash do conteúdo do mapa, hash da tabela de custos, masmorra?, início, fim)
+# Valor: custo e o caminho codificado por comprimento de sequência de direções,
+# ex.: "D3R2U1" = 3 passos para baixo, 2 para a direita e 1 para cima a partir do início.
+# O número de entradas é limitado; ao passar do limite saem as usadas há mais tempo (LRU).
+# Um acerto não escreve no banco: o "usado em" fica em memória e é gravado junto com o
+# próximo put ou no close, numa transação só (o banco usa WAL com synchronous=NORMAL).
+
+DEFAULT_MAX_ENTRIES = 100000
+
+_MOVES = {(1, 0): 'D', (-1, 0): 'U', (0, 1): 'R', (0, -1): 'L'}
+_STEPS = {letter: move for move, letter in _MOVES.items()}
+
+def encode_path(path):
+    runs = []
+    for (r0, c0), (r1, c1) in zip(path, path[1:]):
+        letter = _MOVES[(r1-r0, c1-c0)]
+        if runs and runs[-1][0] == letter: runs[-1][1] += 1
+        else: runs.append([letter, 1])
+    return ''.join(f"{letter}{count}" for letter, count in runs)
+
+def decode_path(start, code):
+    # start é a posição 0-based da primeira célula do caminho
+    path = [start]
+    r, c = start
+    letter, digits = None, ''
+    for ch in code + 'E':
+        if ch.isdigit():
+            digits += ch
+            continue
+        if letter:
+            dr, dc = _STEPS[letter]
+            for _ in range(int(digits)):
+                r, c = r+dr, c+dc
+                path.append((r, c))
+        letter, digits = ch, ''
+    return path
+
+class PathCache:
+    def __init__(self, file_path, max_entries=DEFAULT_MAX_ENTRIES):
+        folder = os.path.dirname(file_path)
+        if folder: os.makedirs(folder, exist_ok=True)
+        self.max_entries = max_entries
+        self.hits = self.misses = self.evictions = 0
+        self.conn = sqlite3.connect(file_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        # Acertos ainda não gravados: {chave: relógio do último uso}
+        self._used = {}
+        with self.conn:
+            self.conn.execute("CREATE TABLE IF NOT EXISTS paths "
+                              "(key TEXT PRIMARY KEY, cost INTEGER, path TEXT, used INTEGER)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS paths_used ON paths (used)")
+        self._clock = self.conn.execute("SELECT COALESCE(MAX(used), 0) FROM paths").fetchone()[0]
+
+    def close(self):
+        if self._used:
+            with self.conn:
+                self._write_used()
+        self.conn.close()
+
+    def _write_used(self):
+        self.conn.executemany("UPDATE paths SET used = ? WHERE key = ?", [(t, k) for k, t in self._used.items()])
+        self._used.clear()
+
+    @staticmethod
+    def key(maze, start, end, is_dungeon=False):
+        grid = as_grid(maze)
+        table = hashlib.sha256(grid.cost_lut(is_dungeon).tobytes()).hexdigest()
+        return f"{grid.content_hash()}:{table}:{int(is_dungeon)}:{start[0]},{start[1]}:{end[0]},{end[1]}"
+
+    def _tick(self):
+        self._clock += 1
+        return self._clock
+
+    # Retorna (caminho, custo) ou None se não estiver no cache
+    def get(self, maze, start, end, is_dungeon=False):
+        key = self.key(maze, start, end, is_dungeon)
+        row = self.conn.execute("SELECT cost, path FROM paths WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._used[key] = self._tick()
+        cost, code = row
+        # Custo NULL = não existe caminho entre os pontos
+        if cost is None: return None, float('inf')
+        return decode_path((start[0]-1, start[1]-1), code), cost
+
+    def put(self, maze, start, end, is_dungeon, path, cost):
+        key = self.key(maze, start, end, is_dungeon)
+        row = (None, '') if path is None else (cost, encode_path(path))
+        self._used.pop(key, None)
+        with self.conn:
+            # Usos pendentes antes da remoção, para que ela veja a ordem LRU atual
+            if self._used: self._write_used()
+            self.conn.execute("INSERT OR REPLACE INTO paths VALUES (?, ?, ?, ?)", (key, *row, self._tick()))
+            excess = self.conn.execute("SELECT COUNT(*) FROM paths").fetchone()[0] - self.max_entries
+            if excess > 0:
+                self.conn.execute("DELETE FROM paths WHERE key IN "
+                                  "(SELECT key FROM paths ORDER BY used LIMIT ?)", (excess,))
+                self.evictions += excess
+
+    # a_star_search com o cache na frente
+    def search(self, maze, start, end, is_dungeon=False):
+        result = self.get(maze, start, end, is_dungeon)
+        if result is None:
+            result = a_star_search(maze, start, end, is_dungeon)
+            self.put(maze, start, end, is_dungeon, *result)
+        return result
+
+    def stats(self):
+        entries = self.conn.execute("SELECT COUNT(*) FROM paths").fetchone()[0]
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'entries': entries, 'max_entries': self.max_entries}
@@ -0,0 +1,115 @@
+import weakref
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+from grid import as_grid
+
+# Cores
+aSTAR_COLORS = {
+    'M': (147, 141, 83), 'A': (195, 187, 149), 'W': (82, 140, 212),
+    'F': (3, 174, 81), 'G': (148, 205, 74), 'X': (0, 0, 0), 'Y': (0, 0, 0),
+    'Z': (0, 0, 0), 'S': (255, 0, 0), 'L': (255, 0, 255)
+}
+
+DUNGEON_COLORS = {
+    '#': (183, 183, 183), '.': (225, 225, 225), 'E': (0, 255, 0), 'P': (255, 0, 0)
+}
+
+PATH_COLOR = (255, 255, 255)
+GRID_COLOR = (120, 120, 120)
+BORDER_COLOR = (0, 0, 0)
+
+# Maior imagem desenhada de uma vez, em pixels; acima disso o mapa é desenhado reduzido
+# (large_render), sem rótulos
+MAX_PIXELS = 16_000_000
+
+def fits_canvas(rows, cols, cell_size=20, max_pixels=MAX_PIXELS):
+    return (cols*cell_size+1) * (rows*cell_size+1) <= max_pixels
+
+def text_size(draw, text, font):
+    try:
+        bbox = draw.textbbox((0,0), text, font=font)
+        return bbox[2]-bbox[0], bbox[3]-bbox[1]
+    except AttributeError:
+        return draw.textsize(text, font=font)
+
+# A fonte é carregada uma única vez
+_font = None
+
+def get_font():
+    global _font
+    if _font is None:
+        try: _font = ImageFont.truetype("arial.ttf",14)
+        except (OSError, ImportError): _font = ImageFont.load_default()
+    return _font
+
+# Tabela de cores por código de letra (256 entradas), preto para letras sem cor
+def color_lut(is_dungeon=False):
+    lut = np.zeros((256, 3), dtype=np.uint8)
+    for terrain, color in (DUNGEON_COLORS if is_dungeon else aSTAR_COLORS).items():
+        lut[ord(terrain)] = color
+    return lut
+
+# Imagem base de um mapa (rótulos, células coloridas e linhas da grade), sem caminho
+# Montada com NumPy: a tabela de cores aplicada às letras é ampliada pelo tamanho da
+# célula e as linhas da grade são fatias da matriz. Fica guardada por mapa, modo e
+# tamanho de célula e é refeita quando o mapa muda.
+_bases = weakref.WeakKeyDictionary()
+
+def base_image(maze, is_dungeon=False, cell_size=20):
+    grid = as_grid(maze)
+    cache = _bases.setdefault(grid, {})
+    cached = cache.get((is_dungeon, cell_size))
+    if cached is not None and cached[0] == grid.version:
+        return cached[1], cached[2]
+
+    rows, cols = grid.rows, grid.cols
+    font = get_font()
+    tmp_draw = ImageDraw.Draw(Image.new("RGB",(10,10)))
+    label_w,label_h = text_size(tmp_draw,str(max(rows,cols)),font)
+    label_space = max(label_w,label_h)+8
+    img = Image.new("RGB", (label_space+cols*cell_size+1,label_space+rows*cell_size+1),(255,255,255))
+    draw = ImageDraw.Draw(img)
+    for c in range(cols):
+        txt=str(c+1); tw,th=text_size(draw,txt,font)
+        x=label_space+c*cell_size+(cell_size-tw)/2; y=(label_space-th)/2
+        draw.text((x,y),txt,fill=(0,0,0),font=font)
+    for r in range(rows):
+        txt=str(r+1); tw,th=text_size(draw,txt,font)
+        x=(label_space-tw)/2; y=label_space+r*cell_size+(cell_size-th)/2
+        draw.text((x,y),txt,fill=(0,0,0),font=font)
+
+    base = np.array(img)
+    cells = color_lut(is_dungeon)[grid.terrain()]
+    top, bottom, right = label_space, label_space+rows*cell_size, label_space+cols*cell_size
+    base[top:bottom, top:right] = cells.repeat(cell_size, axis=0).repeat(cell_size, axis=1)
+    base[top:bottom+1:cell_size, top:right+1] = GRID_COLOR
+    base[top:bottom+1, top:right+1:cell_size] = GRID_COLOR
+    base.setflags(write=False)
+    cache[(is_dungeon, cell_size)] = (grid.version, base, label_space)
+    return base, label_space
+
+# Imagem do mapa com o caminho: cópia da base com as células do caminho pintadas
+def render_path(maze, path, is_dungeon=False, cell_size=20):
+    grid = as_grid(maze)
+    if not fits_canvas(grid.rows, grid.cols, cell_size):
+        from large_render import render_large
+        return Image.fromarray(render_large(grid, path, is_dungeon))
+    base, label_space = base_image(grid, is_dungeon, cell_size)
+    pixels = base.copy()
+    for x,y in path:
+        x0=label_space+y*cell_size; y0=label_space+x*cell_size
+        pixels[y0:y0+cell_size+1, x0:x0+cell_size+1] = PATH_COLOR
+    img = Image.fromarray(pixels)
+    ImageDraw.Draw(img).rectangle([label_space,label_space,label_space+grid.cols*cell_size,label_space+grid.rows*cell_size],
+                                  outline=BORDER_COLOR,width=2)
+    return img
+
+def plot_path_on_map(maze, path, filename, is_dungeon=False, cell_size=20):
+    grid = as_grid(maze)
+    if not fits_canvas(grid.rows, grid.cols, cell_size):
+        # Grava em faixas, sem montar a imagem inteira
+        from large_render import plot_large_map
+        plot_large_map(grid, path, filename, is_dungeon)
+        return
+    render_path(maze, path, is_dungeon, cell_size).save(filename)
+    print(f"Mapa visual salvo em: {filename}")
@@ -0,0 +1,156 @@
+import heapq
+import numpy as np
+from grid import as_grid
+
+# Replanejamento incremental (D* Lite) para um mapa e um objetivo fixos
+# A busca é feita do objetivo para trás: g[s] é o custo de s até o objetivo e rhs[s] é a
+# previsão de um passo (min sobre os vizinhos s' de custo de entrar em s' + g[s']).
+# Quando células mudam, só os vizinhos delas são reavaliados e a fila reprocessa a parte
+# da árvore de busca afetada, em vez de refazer a busca inteira.
+# km acumula a heurística quando o início muda entre consultas (chaves antigas continuam válidas).
+
+class IncrementalPlanner:
+    def __init__(self, maze, goal, is_dungeon=False):
+        self.grid = as_grid(maze)
+        self.goal = tuple(goal)
+        self.is_dungeon = is_dungeon
+        self.expanded = 0
+        self._reset()
+
+    def _reset(self):
+        grid = self.grid
+        self.costs, self.wall = grid.flat_costs(self.is_dungeon)
+        self.scale = self._min_step()
+        self.version = grid.version
+        self.goal_idx = grid.index(self.goal[0]-1, self.goal[1]-1)
+        self.g, self.rhs = {}, {self.goal_idx: 0}
+        self.queue, self.open = [], {}
+        self.km, self.start_idx = 0, None
+
+    # Menor custo de passo da tabela (não só das células atuais), para a heurística
+    # continuar admissível quando uma célula muda para um terreno mais barato
+    def _min_step(self):
+        lut = self.grid.cost_lut(self.is_dungeon)
+        passable = lut[lut != self.wall]
+        return int(passable.min()) if passable.size else 1
+
+    def _h(self, idx):
+        # Distância de Manhattan (escalada) entre o início atual e idx
+        (r, c), (sr, sc) = divmod(idx, self.grid.width), divmod(self.start_idx, self.grid.width)
+        return (abs(r-sr) + abs(c-sc)) * self.scale
+
+    def _key(self, idx):
+        inf = float('inf')
+        best = min(self.g.get(idx, inf), self.rhs.get(idx, inf))
+        return (best + self._h(idx) + self.km, best)
+
+    def _push(self, idx):
+        key = self._key(idx)
+        self.open[idx] = key
+        heapq.heappush(self.queue, (key, idx))
+
+    def _neighbors(self, idx):
+        width = self.grid.width
+        return (idx-width, idx+width, idx-1, idx+1)
+
+    def _update_vertex(self, idx):
+        # Células da borda artificial nunca são início nem caminho
+        r, c = divmod(idx, self.grid.width)
+        if not (1 <= r <= self.grid.rows and 1 <= c <= self.grid.cols): return
+        inf = float('inf')
+        costs, wall, g = self.costs, self.wall, self.g
+        if idx != self.goal_idx:
+            self.rhs[idx] = min((costs[n] + g.get(n, inf) for n in self._neighbors(idx) if costs[n] != wall),
+                                default=inf)
+        if g.get(idx, inf) != self.rhs.get(idx, inf): self._push(idx)
+        else: self.open.pop(idx, None)
+
+    # Células que podem entrar em idx (só existem se idx não for parede)
+    def _predecessors(self, idx):
+        return () if self.costs[idx] == self.wall else self._neighbors(idx)
+
+    def _top(self):
+        while self.queue:
+            key, idx = self.queue[0]
+            if self.open.get(idx) == key: return key, idx
+            heapq.heappop(self.queue)
+        return None, None
+
+    def _compute(self):
+        inf = float('inf')
+        s = self.start_idx
+        while True:
+            key, idx = self._top()
+            if key is None: break
+            if key >= self._key(s) and self.rhs.get(s, inf) == self.g.get(s, inf): break
+            heapq.heappop(self.queue)
+            new_key = self._key(idx)
+            if key < new_key:
+                self._push(idx)
+                continue
+            del self.open[idx]
+            self.expanded += 1
+            if self.g.get(idx, inf) > self.rhs.get(idx, inf):
+                self.g[idx] = self.rhs[idx]
+                for p in self._predecessors(idx): self._update_vertex(p)
+            else:
+                self.g[idx] = inf
+                for p in self._predecessors(idx) + (idx,): self._update_vertex(p)
+
+    # Melhor caminho do início (linha, coluna 1-based) até o objetivo: (caminho 0-based, custo)
+    def plan(self, start):
+        if self.grid.version != self.version:
+            # O mapa foi alterado por fora do planejador: recomeça do zero
+            self._reset()
+        start_idx = self.grid.index(start[0]-1, start[1]-1)
+        if self.start_idx is None:
+            # Primeira consulta desde o início (ou recomeço): a busca parte do objetivo
+            self.start_idx = start_idx
+            self._push(self.goal_idx)
+        elif start_idx != self.start_idx:
+            self.km += self._h(start_idx)
+            self.start_idx = start_idx
+        self._compute()
+
+        inf = float('inf')
+        cost = self.rhs.get(start_idx, inf)
+        if cost == inf: return None, inf
+        costs, wall, g = self.costs, self.wall, self.g
+        path, idx = [self.grid.position(start_idx)], start_idx
+        while idx != self.goal_idx and len(path) <= len(costs):
+            idx = min((n for n in self._neighbors(idx) if costs[n] != wall), key=lambda n: costs[n] + g.get(n, inf))
+            path.append(self.grid.position(idx))
+        return path, cost
+
+    def _changed(self, cells):
+        if self.start_idx is None:
+            # Ainda sem consulta (ou recomeçado): o próximo plan() busca do zero no mapa já alterado
+            self._reset()
+            return
+        for idx in cells:
+            for p in self._neighbors(idx):
+                self._update_vertex(p)
+        self.version = self.grid.version
+
+    # Aplica um lote de mudanças de terreno: updates = {(linha, coluna) 1-based: letra}
+    def update_cells(self, updates):
+        if self.grid.version != self.version:
+            self._reset()
+        self.grid.set_cells(updates)
+        self._changed(self.grid.index(r-1, c-1) for r, c in updates)
+
+    # Reaplica a tabela de custos atual (ex.: depois de alterar TERRAIN_COSTS)
+    def update_cost_table(self):
+        if self.grid.version != self.version:
+            self._reset()
+        old = self.grid.cost_array(self.is_dungeon).reshape(-1).astype(np.int64)
+        old[old == self.wall] = -1
+        self.grid.reset_costs()
+        self.costs, self.wall = self.grid.flat_costs(self.is_dungeon)
+        if self._min_step() != self.scale:
+            # A escala da heurística mudou, então as chaves guardadas não valem mais
+            self._reset()
+            return
+        new = np.asarray(self.costs, dtype=np.int64)
+        new[new == self.wall] = -1
+        self._changed(int(i) for i in np.flatnonzero(old != new))
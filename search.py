@@ -0,0 +1,118 @@
+import heapq
+import time
+from grid import as_grid
+from jps import jps_search
+from bidirectional import bidirectional_search
+from instrumentation import search_counts
+
+# Função heurística (distância de Manhattan) - (Admissível porque nunca superestima o custo real)
+# scale = menor custo de um passo no mapa; com ele a estimativa continua admissível e fica
+# na mesma escala dos custos (sem ele, com passo mínimo 10, ela seria 10x menor que o real)
+def heuristic(a, b, scale=1):
+    return (abs(a[0] - b[0]) + abs(a[1] - b[1])) * scale
+
+# Implementação da busca A*
+# O estado da busca é plano: cada célula vira um índice na matriz com borda do Grid,
+# o melhor g conhecido e o pai de cada célula ficam em dicionários e a fila de
+# prioridade usa remoção preguiçosa (entradas com g desatualizado são descartadas
+# ao sair do heap). Assim cada consulta custa O(E log V).
+# field: campo de distâncias (distance_field) até end, usado como heurística perfeita
+# use_jps: em mapas de custo uniforme (masmorras) usa o Jump Point Search, com o mesmo
+# custo ótimo e o caminho completo célula a célula
+# bidirectional: busca simultânea a partir do início e do objetivo (mesmo custo ótimo)
+# landmarks: marcos ALT (heuristics.landmarks_for), combinados com a distância de Manhattan
+# h_scale: escala da distância de Manhattan (padrão: menor custo de passo do mapa)
+# stats: dicionário opcional que recebe o algoritmo usado ('algorithm'), os contadores da
+# busca ('expanded', 'pushed', 'max_open', 'duplicates', ver instrumentation) e 'wall_time'
+def a_star_search(maze, start, end, is_dungeon=False, field=None, use_jps=True, bidirectional=False,
+                  landmarks=None, h_scale=None, stats=None):
+    if stats is None:
+        return _search(maze, start, end, is_dungeon, field, use_jps, bidirectional, landmarks, h_scale, None)
+    started = time.perf_counter()
+    result = _search(maze, start, end, is_dungeon, field, use_jps, bidirectional, landmarks, h_scale, stats)
+    stats['wall_time'] = time.perf_counter() - started
+    return result
+
+def _search(maze, start, end, is_dungeon, field, use_jps, bidirectional, landmarks, h_scale, stats):
+    if not maze: return None, float('inf')
+    grid = as_grid(maze)
+    if bidirectional and field is None:
+        if stats is not None: stats['algorithm'] = 'bidirectional'
+        return bidirectional_search(grid, start, end, is_dungeon, stats)
+    if use_jps and field is None and grid.uniform_cost(is_dungeon) is not None:
+        if stats is not None: stats['algorithm'] = 'jps'
+        return jps_search(grid, start, end, is_dungeon, stats)
+    if stats is not None: stats['algorithm'] = 'a_star'
+    costs, wall = grid.flat_costs(is_dungeon)
+    width = grid.width
+    scale = grid.min_cost(is_dungeon) if h_scale is None else h_scale
+
+    # Ajuste para usar índices (linha-1, coluna-1) (lista em python começa com 0)
+    er, ec = end[0], end[1]
+    start_idx = grid.index(start[0]-1, start[1]-1)
+    end_idx = grid.index(end[0]-1, end[1]-1)
+
+    # hfn = heurística por índice plano; None = distância de Manhattan calculada no laço
+    hfn = None
+    if field is not None:
+        if field.goal != tuple(end) or field.is_dungeon != is_dungeon or not field.is_valid(grid):
+            raise ValueError("O campo de distâncias não corresponde a este mapa/objetivo")
+        hfn = field.flat_dist.__getitem__
+    elif landmarks is not None:
+        if landmarks.is_dungeon != is_dungeon or not landmarks.is_valid(grid):
+            raise ValueError("Os marcos ALT não correspondem a este mapa")
+        alt = landmarks.heuristic_to(end_idx)
+        def hfn(idx):
+            r, c = divmod(idx, width)
+            return max(alt(idx), (abs(r-er) + abs(c-ec)) * scale)
+
+    # best_g = menor custo conhecido até cada célula, parent = célula anterior no caminho
+    best_g = {start_idx: 0}
+    parent = {start_idx: -1}
+    # Entradas do heap: (f, h, índice, g) - empate em f favorece quem está mais perto do objetivo
+    h0 = heuristic(start, end, scale) if hfn is None else hfn(start_idx)
+    open_list = [(h0, h0, start_idx, 0)]
+    # Contadores: stale = entradas desatualizadas descartadas; max_open só é medido com stats
+    expanded = stale = max_open = 0
+    track = stats is not None
+
+    while open_list:
+        # Pega a célula com menor f = g + h
+        _, _, idx, g = heapq.heappop(open_list)
+        # Entrada antiga (a célula já foi alcançada por um caminho mais barato)
+        if g > best_g[idx]:
+            stale += 1
+            continue
+        expanded += 1
+
+        # Se chegamos no destino, reconstruímos o caminho
+        if idx == end_idx:
+            path = []
+            while idx != -1:
+                path.append(grid.position(idx))
+                idx = parent[idx]
+            if track: stats.update(search_counts(expanded, stale, len(open_list), len(best_g), max_open))
+            return path[::-1], g
+
+        # Expande vizinhos (N, S, L, O); a borda do Grid é parede, então não há teste de limites
+        for nidx in (idx-width, idx+width, idx-1, idx+1):
+            cost = costs[nidx]
+            if cost == wall: continue
+
+            # Só segue se o novo custo acumulado melhora o que já conhecemos
+            new_g = g + cost
+            if new_g >= best_g.get(nidx, float('inf')): continue
+            best_g[nidx] = new_g
+            parent[nidx] = idx
+
+            # Adiciona vizinho à lista de exploração (linha/coluna 1-based, como end)
+            if hfn is None:
+                nx, ny = divmod(nidx, width)
+                h = (abs(nx-er) + abs(ny-ec)) * scale
+            else:
+                h = hfn(nidx)
+            heapq.heappush(open_list, (new_g + h, h, nidx, new_g))
+        if track and len(open_list) > max_open: max_open = len(open_list)
+
+    if track: stats.update(search_counts(expanded, stale, 0, len(best_g), max_open))
+    return None, float('inf')
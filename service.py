@@ -0,0 +1,211 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from search import a_star_search
+from order_solver import choose_solver, solve_order
+from parallel import default_workers
+from main import JourneyLegs, journey_report, load_scenario, simulate_journey
+from service_client import DEFAULT_PORT
+
+# Serviço residente de consultas de caminho (asyncio)
+# Os mapas são carregados uma vez; os pedidos chegam como linhas JSON por um socket Unix ou
+# TCP e cada resposta é uma linha JSON com o mesmo "id". As buscas rodam num pool de
+# processos que herda os mapas (fork) ou os recebe uma vez pelo initializer. Consultas
+# iguais em andamento são juntadas numa só e os resultados ficam num cache LRU em memória.
+# Pedidos (campo "op"):
+#   ping                                    -> {}
+#   maps                                    -> mapas, dimensões e pontos de passagem
+#   path    map, start, end [, dungeon, image] -> custo e caminho (0-based); image salva a figura
+#           (nome relativo, gravado dentro da pasta de imagens do serviço)
+#   journey [render]                        -> melhor ordem, custo total e trechos; render grava as
+#           imagens dos trechos na pasta de imagens do serviço
+#   stats                                   -> contadores do serviço
+
+DEFAULT_CACHE_SIZE = 100000
+DEFAULT_IMAGE_FOLDER = "percurso"
+
+# Estado dos processos do pool: mapas por nome e o cenário completo
+_maps = None
+_scenario = None
+
+def _init_worker(maps=None, scenario=None):
+    global _maps, _scenario
+    if maps is not None:
+        _maps, _scenario = maps, scenario
+
+def _path_task(name, start, end, is_dungeon, image):
+    path, cost = a_star_search(_maps[name], start, end, is_dungeon)
+    if image and path:
+        from render import render_path
+        os.makedirs(os.path.dirname(image), exist_ok=True)
+        render_path(_maps[name], path, is_dungeon).save(image)
+    return path, cost
+
+def _journey_task(render, image_folder=DEFAULT_IMAGE_FOLDER):
+    hyrule, dungeons, start_pos, lost_woods = _scenario
+    legs = JourneyLegs(hyrule, dungeons, start_pos, lost_woods)
+    method = choose_solver(len(dungeons))
+    order, cost = solve_order(legs.order_matrix(), method)
+    if render:
+        from image_writer import ImageWriter
+        os.makedirs(image_folder, exist_ok=True)
+        with ImageWriter(verbose=False) as writer:
+            simulate_journey(order, hyrule, dungeons, start_pos, lost_woods, legs=legs, writer=writer, verbose=False,
+                             image_folder=image_folder)
+    return journey_report(legs, order, cost, method)
+
+class PathService:
+    def __init__(self, map_folder="mapas", workers=None, cache_size=DEFAULT_CACHE_SIZE, image_folder=DEFAULT_IMAGE_FOLDER):
+        scenario = load_scenario(map_folder)
+        if not scenario: raise FileNotFoundError(f"Cenário incompleto em {map_folder}")
+        hyrule, dungeons = scenario[0], scenario[1]
+        self.maps = {'hyrule': hyrule}
+        self.maps.update((f'masmorra{k+1}', d[1]) for k, d in enumerate(dungeons))
+        for name, grid in self.maps.items():
+            grid.cost_array(name != 'hyrule')
+        if 'fork' in multiprocessing.get_all_start_methods():
+            # Com fork os processos herdam os mapas já carregados
+            global _maps, _scenario
+            _maps, _scenario = self.maps, scenario
+            context, initargs = multiprocessing.get_context('fork'), ()
+        else:
+            context, initargs = multiprocessing.get_context(), (self.maps, scenario)
+        self.pool = ProcessPoolExecutor(workers or default_workers(), mp_context=context,
+                                        initializer=_init_worker, initargs=initargs)
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+        self.image_folder = os.path.realpath(image_folder)
+        self.inflight = {}
+        self.counters = {'requests': 0, 'errors': 0, 'cache_hits': 0, 'coalesced': 0, 'computed': 0}
+
+    def close(self):
+        self.pool.shutdown()
+
+    # Resultado de fn(*args) no pool, com cache LRU e junção de consultas iguais em andamento
+    async def _cached(self, key, fn, *args):
+        cache = self.cache
+        if key in cache:
+            self.counters['cache_hits'] += 1
+            cache.move_to_end(key)
+            return cache[key]
+        pending = self.inflight.get(key)
+        if pending is not None:
+            self.counters['coalesced'] += 1
+            return await asyncio.shield(pending)
+        pending = self.inflight[key] = asyncio.get_running_loop().run_in_executor(self.pool, fn, *args)
+        try:
+            result = await pending
+        finally:
+            del self.inflight[key]
+        self.counters['computed'] += 1
+        cache[key] = result
+        if len(cache) > self.cache_size: cache.popitem(last=False)
+        return result
+
+    def _position(self, grid, value):
+        r, c = map(int, value)
+        if not (1 <= r <= grid.rows and 1 <= c <= grid.cols):
+            raise ValueError(f"Posição {(r, c)} fora do mapa")
+        return r, c
+
+    # O cliente escolhe só o nome da imagem: caminhos absolutos, '..' ou qualquer coisa que
+    # saia da pasta de imagens (por exemplo via link simbólico) são recusados
+    def _image_path(self, value):
+        name = str(value)
+        if not name or os.path.isabs(name) or '..' in name.replace('\\', '/').split('/'):
+            raise ValueError(f"Nome de imagem inválido: {name}")
+        image = os.path.realpath(os.path.join(self.image_folder, name))
+        if os.path.commonpath([image, self.image_folder]) != self.image_folder or image == self.image_folder:
+            raise ValueError(f"Nome de imagem inválido: {name}")
+        return image
+
+    async def op_ping(self, request):
+        return {}
+
+    async def op_maps(self, request):
+        return {'maps': {name: {'rows': g.rows, 'cols': g.cols, 'waypoints': g.waypoints} for name, g in self.maps.items()}}
+
+    async def op_path(self, request):
+        name = request['map']
+        if name not in self.maps: raise ValueError(f"Mapa desconhecido: {name}")
+        grid = self.maps[name]
+        start, end = self._position(grid, request['start']), self._position(grid, request['end'])
+        is_dungeon = bool(request.get('dungeon', name != 'hyrule'))
+        image = self._image_path(request['image']) if request.get('image') else None
+        key = ('path', name, start, end, is_dungeon, image)
+        path, cost = await self._cached(key, _path_task, name, start, end, is_dungeon, image)
+        return {'cost': cost if path else None, 'path': path}
+
+    async def op_journey(self, request):
+        render = bool(request.get('render'))
+        return await self._cached(('journey', render), _journey_task, render, self.image_folder)
+
+    async def op_stats(self, request):
+        return {**self.counters, 'cache_entries': len(self.cache), 'inflight': len(self.inflight)}
+
+    async def _answer(self, line, writer):
+        self.counters['requests'] += 1
+        request = {}
+        try:
+            request = json.loads(line)
+            handler = getattr(self, 'op_' + str(request.get('op')), None)
+            if handler is None: raise ValueError(f"Operação desconhecida: {request.get('op')}")
+            reply = {'id': request.get('id'), 'ok': True, **(await handler(request))}
+        except Exception as error:
+            self.counters['errors'] += 1
+            reply = {'id': request.get('id') if isinstance(request, dict) else None, 'ok': False, 'error': str(error)}
+        writer.write(json.dumps(reply, separators=(',', ':')).encode() + b'\n')
+
+    # Uma conexão pode mandar vários pedidos sem esperar as respostas (elas levam o "id")
+    async def handle(self, reader, writer):
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line: break
+                task = asyncio.create_task(self._answer(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks: await asyncio.gather(*tasks)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+async def serve(service, socket_path=None, host='127.0.0.1', port=DEFAULT_PORT):
+    if socket_path:
+        if os.path.exists(socket_path): os.remove(socket_path)
+        server = await asyncio.start_unix_server(service.handle, path=socket_path)
+        print(f"Serviço ouvindo em {socket_path}")
+    else:
+        server = await asyncio.start_server(service.handle, host, port)
+        print(f"Serviço ouvindo em {host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serviço de consultas de caminho")
+    parser.add_argument('--mapas', default="mapas", help="pasta do cenário")
+    parser.add_argument('--socket', help="caminho do socket Unix (padrão: TCP)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--processos', type=int, help="processos para as buscas (padrão: número de CPUs)")
+    parser.add_argument('--cache', type=int, default=DEFAULT_CACHE_SIZE, help="resultados guardados em memória")
+    parser.add_argument('--saida-imagens', default=DEFAULT_IMAGE_FOLDER,
+                        help="pasta onde ficam as imagens pedidas em 'path' (os clientes só dão o nome)")
+    args = parser.parse_args(argv)
+    service = PathService(args.mapas, args.processos, args.cache, args.saida_imagens)
+    try:
+        asyncio.run(serve(service, args.socket, args.host, args.porta))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import argparse
+import json
+import socket
+
+# Cliente simples (síncrono) do serviço de caminhos: um pedido por vez na mesma conexão
+# Uso: python service_client.py path hyrule 28,25 6,7
+#      python service_client.py journey [--render]
+#      python service_client.py --socket /tmp/iatp.sock stats
+
+# Porta TCP padrão do serviço (service.py)
+DEFAULT_PORT = 8765
+
+class ServiceError(Exception):
+    pass
+
+class ServiceClient:
+    def __init__(self, socket_path=None, host='127.0.0.1', port=DEFAULT_PORT):
+        if socket_path:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.connect(socket_path)
+        else:
+            self.sock = socket.create_connection((host, port))
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._file = self.sock.makefile('rwb')
+        self._next_id = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._file.close()
+        self.sock.close()
+
+    def request(self, op, **fields):
+        self._next_id += 1
+        self._file.write(json.dumps({'id': self._next_id, 'op': op, **fields}).encode() + b'\n')
+        self._file.flush()
+        line = self._file.readline()
+        if not line: raise ServiceError("Conexão encerrada pelo serviço")
+        reply = json.loads(line)
+        if not reply.get('ok'): raise ServiceError(reply.get('error'))
+        return reply
+
+    # Caminho entre start e end (linha, coluna 1-based): (caminho 0-based, custo), como a_star_search
+    def path(self, map_name, start, end, dungeon=None, image=None):
+        fields = {'map': map_name, 'start': list(start), 'end': list(end)}
+        if dungeon is not None: fields['dungeon'] = dungeon
+        if image: fields['image'] = image
+        reply = self.request('path', **fields)
+        if reply['path'] is None: return None, float('inf')
+        return [tuple(p) for p in reply['path']], reply['cost']
+
+    def journey(self, render=False):
+        return self.request('journey', render=render)
+
+    def stats(self):
+        return self.request('stats')
+
+def _position(text):
+    r, c = text.split(',')
+    return int(r), int(c)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cliente do serviço de caminhos")
+    parser.add_argument('--socket', help="socket Unix do serviço (padrão: TCP)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=DEFAULT_PORT)
+    commands = parser.add_subparsers(dest='op', required=True)
+    path = commands.add_parser('path', help="caminho entre dois pontos de um mapa")
+    path.add_argument('map')
+    path.add_argument('start', type=_position, help="linha,coluna (1-based)")
+    path.add_argument('end', type=_position, help="linha,coluna (1-based)")
+    path.add_argument('--imagem', help="nome do PNG com o caminho, relativo à pasta de imagens do serviço")
+    journey = commands.add_parser('journey', help="melhor ordem das masmorras")
+    journey.add_argument('--render', action='store_true', help="salva as imagens da jornada em percurso/")
+    commands.add_parser('maps')
+    commands.add_parser('stats')
+    commands.add_parser('ping')
+    args = parser.parse_args(argv)
+
+    with ServiceClient(args.socket, args.host, args.porta) as client:
+        try:
+            if args.op == 'path':
+                reply = client.request('path', map=args.map, start=args.start, end=args.end, image=args.imagem)
+            elif args.op == 'journey':
+                reply = client.journey(args.render)
+            else:
+                reply = client.request(args.op)
+        except ServiceError as error:
+            print(f"Erro: {error}")
+            return 1
+    print(json.dumps(reply))
+
+if __name__ == "__main__":
+    raise SystemExit(main())
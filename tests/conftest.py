@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Os módulos do projeto ficam na raiz do repositório (ao lado de main.py)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
@@ -0,0 +1,84 @@
+import os
+import numpy as np
+import pytest
+from grid import Grid
+from map_generator import dungeon_map, hyrule_map, random_points
+from search import a_star_search
+from main import load_scenario
+
+# Equivalência da busca bidirecional com a busca em um sentido (A* puro e JPS)
+# Mesmo custo e um caminho válido: começa no início, termina no objetivo, anda em 4
+# direções, não entra em paredes e a soma dos custos das células de entrada é o custo.
+
+MAPS_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mapas")
+
+def check_path(grid, path, cost, start, end, is_dungeon):
+    costs = grid.cost_array(is_dungeon)[1:-1, 1:-1]
+    wall = np.iinfo(costs.dtype).max
+    assert path[0] == (start[0]-1, start[1]-1)
+    assert path[-1] == (end[0]-1, end[1]-1)
+    for (r0, c0), (r1, c1) in zip(path, path[1:]):
+        assert abs(r0-r1) + abs(c0-c1) == 1
+        assert costs[r1, c1] != wall
+    assert sum(int(costs[r, c]) for r, c in path[1:]) == cost
+
+def check_equivalent(grid, start, end, is_dungeon):
+    plain = a_star_search(grid, start, end, is_dungeon, use_jps=False)
+    jps = a_star_search(grid, start, end, is_dungeon)
+    path, cost = a_star_search(grid, start, end, is_dungeon, bidirectional=True)
+    assert cost == plain[1] == jps[1]
+    if plain[0] is None:
+        assert path is None
+    else:
+        check_path(grid, path, cost, start, end, is_dungeon)
+
+# Hyrule com alguns terrenos desconhecidos ('#'), que no modo Hyrule são paredes
+def hyrule_with_walls(size, seed):
+    grid = hyrule_map(size, seed)
+    cells = grid.terrain().copy()
+    cells[np.random.default_rng(seed).random(cells.shape) < 0.2] = ord('#')
+    return Grid(cells)
+
+@pytest.mark.parametrize('seed', range(4))
+def test_random_hyrule(seed):
+    grid = hyrule_with_walls(30, seed)
+    points = random_points(grid, 12, seed)
+    for start, end in zip(points[::2], points[1::2]):
+        check_equivalent(grid, start, end, False)
+
+@pytest.mark.parametrize('seed', range(4))
+def test_random_dungeon(seed):
+    grid = dungeon_map(31, seed, loops=0.1)
+    points = random_points(grid, 12, seed, True)
+    for start, end in zip(points[::2], points[1::2]):
+        check_equivalent(grid, start, end, True)
+
+def test_shipped_maps():
+    scenario = load_scenario(MAPS_FOLDER)
+    assert scenario, "cenário de mapas/ não encontrado"
+    hyrule, dungeons, start_pos, lost_woods = scenario
+    points = [start_pos] + [d[0] for d in dungeons] + [lost_woods]
+    for a in points:
+        for b in points:
+            if a != b: check_equivalent(hyrule, a, b, False)
+    for _, dmap, entrance, pendant in dungeons:
+        check_equivalent(dmap, entrance, pendant, True)
+        check_equivalent(dmap, pendant, entrance, True)
+
+SMALL = Grid.from_maze(['AWASSS#MAS', 'G##GSWMAXG', 'GGG#M#GMSS'])
+
+def test_start_equals_goal():
+    for is_dungeon in (False, True):
+        assert a_star_search(SMALL, (1, 1), (1, 1), is_dungeon, bidirectional=True) == ([(0, 0)], 0)
+    check_equivalent(SMALL, (1, 1), (1, 1), False)
+
+def test_goal_on_wall():
+    assert a_star_search(SMALL, (1, 1), (1, 7), bidirectional=True) == (None, float('inf'))
+    check_equivalent(SMALL, (1, 1), (1, 7), False)
+
+def test_start_on_wall():
+    # Como no A*, dá para sair de uma célula de parede (só a entrada em cada célula custa)
+    path, cost = a_star_search(SMALL, (3, 4), (2, 4), bidirectional=True)
+    assert cost == 10
+    check_equivalent(SMALL, (3, 4), (2, 4), False)
+    check_equivalent(SMALL, (2, 2), (3, 3), False)
@@ -0,0 +1,51 @@
+import pytest
+import grid as grid_module
+from grid import Grid
+from replanning import IncrementalPlanner
+from search import a_star_search
+
+# O planejador incremental deve dar o mesmo custo do A* feito do zero no mapa atual,
+# inclusive quando as mudanças chegam antes da primeira consulta ou depois de uma
+# alteração feita por fora (grid.set_cells)
+
+def open_dungeon():
+    return Grid.from_maze(['....'] * 3)
+
+def check(planner, start):
+    path, cost = planner.plan(start)
+    expected = a_star_search(planner.grid, start, planner.goal, planner.is_dungeon, use_jps=False)[1]
+    assert cost == expected
+    if path is not None:
+        assert path[0] == (start[0]-1, start[1]-1)
+        assert path[-1] == (planner.goal[0]-1, planner.goal[1]-1)
+
+def test_update_before_plan():
+    planner = IncrementalPlanner(open_dungeon(), (2, 2), True)
+    planner.update_cells({(2, 3): '#'})
+    check(planner, (2, 4))
+    planner.update_cells({(1, 2): '#', (3, 2): '#', (2, 1): '#'})
+    check(planner, (2, 4))
+
+def test_update_after_outside_edit():
+    grid = open_dungeon()
+    planner = IncrementalPlanner(grid, (2, 2), True)
+    check(planner, (2, 4))
+    grid.set_cells({(1, 3): '#'})
+    planner.update_cells({(2, 3): '#'})
+    check(planner, (2, 4))
+    check(planner, (1, 4))
+
+@pytest.fixture
+def restore_costs():
+    saved = dict(grid_module.TERRAIN_COSTS)
+    yield
+    grid_module.TERRAIN_COSTS.clear()
+    grid_module.TERRAIN_COSTS.update(saved)
+
+def test_cost_table_before_plan(restore_costs):
+    grid = Grid.from_maze(['GGGG', 'GMMG', 'GGGG'])
+    planner = IncrementalPlanner(grid, (2, 2))
+    grid_module.TERRAIN_COSTS['G'] = 200
+    planner.update_cost_table()
+    check(planner, (2, 3))
+    check(planner, (3, 4))